@@ -60,7 +60,7 @@ from astroid import inference
 from astroid import raw_building
 from astroid.bases import YES, Instance, BoundMethod, UnboundMethod
 from astroid.node_classes import are_exclusive, unpack_infer
-from astroid.scoped_nodes import builtin_lookup
+from astroid.scoped_nodes import builtin_lookup, is_builtin_name
 
 # make a manager instance (borg) as well as Project and Package classes
 # accessible from astroid package
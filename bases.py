@@ -22,10 +22,15 @@ inference utils.
 __docformat__ = "restructuredtext en"
 
 import sys
+from time import time
 from contextlib import contextmanager
+from weakref import WeakValueDictionary
 
 from astroid.exceptions import (InferenceError, AstroidError, NotFoundError,
                                 UnresolvableName, UseInferenceDefault)
+from astroid.manager import AstroidManager
+
+MANAGER = AstroidManager()
 
 
 if sys.version_info >= (3, 0):
@@ -36,6 +41,8 @@ else:
 
 class Proxy(object):
     """a simple proxy object"""
+    # let subclasses use __slots__
+    __slots__ = ()
 
     _proxied = None # proxied object may be set by class or by instance
 
@@ -56,37 +63,232 @@ class Proxy(object):
 
 # Inference ##################################################################
 
+def _key_bit(node, name):
+    """return the bit of path masks for <node> inferred for <name>"""
+    # 61 bits keep masks plain ints
+    return 1 << (hash(node) ^ hash(name)) % 61
+
+
+class _PathFrame(object):
+    """a frame of an inference path: an inferred node and the name looked up
+    at that time, linked to the frame pushed before it.
+
+    Frames are never modified once created, so a path may be shared by several
+    contexts and extended independently by each of them.
+
+    Each frame also holds the union of the bits of the (node, name) pairs on
+    its path, so that most cycle checks end in constant time. Others walk the
+    path, which only grows long in pathological cases that max_depth of
+    INFERENCE_LIMITS is meant to cut: O(1) membership structures that stay
+    correct when paths branch either copy an index per branch or keep
+    sibling branches alive, which costs more on usual inference paths.
+    """
+    __slots__ = ('node', 'name', 'parent', 'depth', 'mask')
+
+    def __init__(self, node, name, parent):
+        self.node = node
+        self.name = name
+        self.parent = parent
+        if parent is None:
+            self.depth = 1
+            self.mask = _key_bit(node, name)
+        else:
+            self.depth = parent.depth + 1
+            self.mask = parent.mask | _key_bit(node, name)
+
+    def contains(self, node, name):
+        """return True if <node> inferred for <name> is on the path"""
+        if not self.mask & _key_bit(node, name):
+            return False
+        frame = self
+        while frame is not None:
+            if frame.node is node and frame.name == name:
+                return True
+            frame = frame.parent
+        return False
+
+
+# raised at each cycle in the inference path, created once
+_STOP_ITERATION = StopIteration()
+
+
 class InferenceContext(object):
-    __slots__ = ('path', 'lookupname', 'callcontext', 'boundnode')
+    __slots__ = ('path', 'lookupname', 'callcontext', 'boundnode', 'deadline')
+    # number of inferences stopped because of a cycle in their path
+    cycles = 0
 
     def __init__(self, path=None):
-        if path is None:
-            self.path = set()
-        else:
-            self.path = path
+        # last frame of the inference path, None when it's empty
+        self.path = path
         self.lookupname = None
         self.callcontext = None
         self.boundnode = None
+        # time after which inference should stop, see InferenceLimits
+        self.deadline = None
 
     def push(self, node):
         name = self.lookupname
-        if (node, name) in self.path:
-            raise StopIteration()
-        self.path.add( (node, name) )
+        if self.path is not None and self.path.contains(node, name):
+            InferenceContext.cycles += 1
+            raise _STOP_ITERATION
+        self.path = _PathFrame(node, name, self.path)
 
     def clone(self):
         # XXX copy lookupname/callcontext ?
         clone = InferenceContext(self.path)
         clone.callcontext = self.callcontext
         clone.boundnode = self.boundnode
+        clone.deadline = self.deadline
         return clone
 
     @contextmanager
     def restore_path(self):
-        path = set(self.path)
+        path = self.path
         yield
         self.path = path
 
+class InferenceLimits(object):
+    """limits on the inference work, with counters of the number of times
+    each of them has been exceeded.
+
+    * `max_depth`, the maximum length of the inference path,
+    * `max_values`, the maximum number of values inferred for a node,
+    * `timeout`, the number of seconds an inference started with an empty
+      path may last.
+
+    Limits are disabled when set to None (the default). Once a limit is
+    exceeded, YES is inferred instead of the remaining values.
+    """
+
+    def __init__(self, max_depth=None, max_values=None, timeout=None):
+        self.max_depth = max_depth
+        self.max_values = max_values
+        self.timeout = timeout
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.depth_exceeded = self.values_exceeded = self.timeout_exceeded = 0
+
+    @property
+    def exceeded(self):
+        """total number of times a limit has been exceeded"""
+        return self.depth_exceeded + self.values_exceeded + self.timeout_exceeded
+
+    def check(self, context):
+        """return True if inference using <context> may go on, else update
+        the counters and return False
+        """
+        path = context.path
+        if path is None:
+            if self.timeout is not None:
+                context.deadline = time() + self.timeout
+            return True
+        if self.max_depth is not None and path.depth >= self.max_depth:
+            self.depth_exceeded += 1
+            return False
+        if context.deadline is not None and time() > context.deadline:
+            self.timeout_exceeded += 1
+            return False
+        return True
+
+INFERENCE_LIMITS = InferenceLimits()
+
+
+class InferenceCache(object):
+    """cache of inference results, with a global switch and hit / miss
+    counters.
+
+    Results of inferences started with an empty inference path are
+    materialized (along with the error ending the inference, if any, and the
+    resulting inference path) once the generator has been exhausted, and
+    stored on the inferred node, keyed on the looked up name, the call context
+    and the bound node. They are dropped when the manager invalidates its
+    caches. Results cut by an inference limit aren't cached.
+
+    When `shared` is true, stored results are also used by inferences started
+    with a non empty path, though they may then include values which would
+    have been cut by a cycle in that path.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.shared = False
+        self.hits = 0
+        self.misses = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def infer(self, node, context):
+        """return an iterator on values inferred for <node>, from the cache if
+        possible
+        """
+        key = self._key(context)
+        cache = node._infer_cache
+        if cache is None or cache[0] != MANAGER.cache_epoch:
+            cache = node._infer_cache = (MANAGER.cache_epoch, {})
+        try:
+            results, error, path = cache[1][key]
+        except KeyError:
+            self.misses += 1
+            # errors raised before the first value is generated are not cached
+            iterator = node._infer_uncached(context)
+            return self._cache_generator(iterator, context, cache[1], key)
+        self.hits += 1
+        if context is not None:
+            # as if inference had been actually done using this context
+            context.path = path
+        return self._replay(results, error)
+
+    def infer_shared(self, node, context):
+        """return an iterator on values inferred for <node> using <context>,
+        whose path isn't empty, from the cache if possible
+        """
+        cache = node._infer_cache
+        if cache is not None and cache[0] == MANAGER.cache_epoch:
+            try:
+                results, error, _ = cache[1][self._key(context)]
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                return self._replay(results, error)
+        return node._infer_uncached(context)
+
+    def _key(self, context):
+        if context is None:
+            return (None, None, None)
+        return (context.lookupname, context.callcontext, context.boundnode)
+
+    def _cache_generator(self, iterator, context, cache, key):
+        exceeded = INFERENCE_LIMITS.exceeded
+        results = []
+        try:
+            for infered in iterator:
+                results.append(infered)
+                yield infered
+        except InferenceError, error:
+            pass
+        else:
+            error = None
+        if context is None:
+            path = None
+        else:
+            path = context.path
+        if INFERENCE_LIMITS.exceeded == exceeded:
+            cache[key] = (results, error, path)
+        if error is not None:
+            raise error
+
+    def _replay(self, results, error):
+        for infered in results:
+            yield infered
+        if error is not None:
+            raise error
+
+INFERENCE_CACHE = InferenceCache()
+
+
 def copy_context(context):
     if context is not None:
         return context.clone()
@@ -121,7 +323,8 @@ def _infer_stmts(stmts, context, frame=None):
             yield YES
             infered = True
     if not infered:
-        raise InferenceError(str(stmt))
+        # the message is only built if needed
+        raise InferenceError(stmt)
 
 
 # special inference objects (e.g. may be returned as nodes by .infer()) #######
@@ -147,42 +350,62 @@ YES = _Yes()
 class Instance(Proxy):
     """a special node representing a class instance"""
     def getattr(self, name, context=None, lookupclass=True):
-        try:
-            values = self._proxied.instance_attr(name, context)
-        except NotFoundError:
+        values = self._getattr(name, context, lookupclass)
+        if not values:
+            raise NotFoundError(name)
+        return list(values)
+
+    def lookup_attr(self, name, default=None, context=None, lookupclass=True):
+        """return the same nodes as getattr, or <default> if the attribute
+        isn't found
+        """
+        values = self._getattr(name, context, lookupclass)
+        if values:
+            return list(values)
+        return default
+
+    def has_attr(self, name, context=None):
+        """return True if getattr would find the attribute"""
+        return bool(self._getattr(name, context))
+
+    def _getattr(self, name, context=None, lookupclass=True):
+        """like getattr, but return an empty list if the attribute isn't
+        found (the returned list must not be modified)
+        """
+        values = self._proxied._instance_attr(name, context)
+        if not values:
             if name == '__class__':
                 return [self._proxied]
             if lookupclass:
                 # class attributes not available through the instance
                 # unless they are explicitly defined
                 if name in ('__name__', '__bases__', '__mro__', '__subclasses__'):
-                    return self._proxied.local_attr(name)
-                return self._proxied.getattr(name, context)
-            raise NotFoundError(name)
+                    try:
+                        return self._proxied.local_attr(name)
+                    except NotFoundError:
+                        return []
+                return self._proxied._getattr(name, context)
+            return []
         # since we've no context information, return matching class members as
         # well
         if lookupclass:
-            try:
-                return values + self._proxied.getattr(name, context)
-            except NotFoundError:
-                pass
+            return self._proxied._instance_and_class_attr(name, context)
         return values
 
     def igetattr(self, name, context=None):
         """inferred getattr"""
-        try:
-            # XXX frame should be self._proxied, or not ?
-            get_attr = self.getattr(name, context, lookupclass=False)
+        # XXX frame should be self._proxied, or not ?
+        get_attr = self._getattr(name, context, lookupclass=False)
+        if get_attr:
             return _infer_stmts(self._wrap_attr(get_attr, context), context,
                                 frame=self)
+        try:
+            # fallback to class'igetattr since it has some logic to handle
+            # descriptors
+            return self._wrap_attr(self._proxied.igetattr(name, context),
+                                   context)
         except NotFoundError:
-            try:
-                # fallback to class'igetattr since it has some logic to handle
-                # descriptors
-                return self._wrap_attr(self._proxied.igetattr(name, context),
-                                       context)
-            except NotFoundError:
-                raise InferenceError(name)
+            raise InferenceError(name)
 
     def _wrap_attr(self, attrs, context=None):
         """wrap bound methods of attrs in a InstanceMethod proxies"""
@@ -192,7 +415,7 @@ class Instance(Proxy):
                     for infered in attr.infer_call_result(self, context):
                         yield infered
                 else:
-                    yield BoundMethod(attr, self)
+                    yield bound_method(attr, self)
             else:
                 yield attr
 
@@ -215,11 +438,7 @@ class Instance(Proxy):
                                       self._proxied.name)
 
     def callable(self):
-        try:
-            self._proxied.getattr('__call__')
-            return True
-        except NotFoundError:
-            return False
+        return self._proxied.has_attr('__call__')
 
     def pytype(self):
         return self._proxied.qname()
@@ -228,8 +447,30 @@ class Instance(Proxy):
         return 'Instance of'
 
 
+def _forward(name):
+    """return a property giving the <name> attribute of the proxied object"""
+    return property(lambda self: getattr(self._proxied, name))
+
+
 class UnboundMethod(Proxy):
     """a special node representing a method not bound to an instance"""
+    __slots__ = ('_proxied', '__weakref__')
+
+    # attributes often accessed during inference, avoiding __getattr__
+    name = _forward('name')
+    parent = _forward('parent')
+    type = _forward('type')
+    args = _forward('args')
+    lineno = _forward('lineno')
+    fromlineno = _forward('fromlineno')
+    root = _forward('root')
+    frame = _forward('frame')
+    scope = _forward('scope')
+    decoratornames = _forward('decoratornames')
+
+    def __getattr__(self, name):
+        return getattr(self._proxied, name)
+
     def __repr__(self):
         frame = self._proxied.parent.frame()
         return '<%s %s of %s at 0x%s' % (self.__class__.__name__,
@@ -254,12 +495,15 @@ class UnboundMethod(Proxy):
         # instance of the class given as first argument.
         if (self._proxied.name == '__new__' and
                 self._proxied.parent.frame().qname() == '%s.object' % BUILTINS):
-            return (x is YES and x or Instance(x) for x in caller.args[0].infer())
+            return (x is YES and x or x.instanciate_class()
+                    for x in caller.args[0].infer())
         return self._proxied.infer_call_result(caller, context)
 
 
 class BoundMethod(UnboundMethod):
     """a special node representing a method bound to an instance"""
+    __slots__ = ('bound',)
+
     def __init__(self,  proxy, bound):
         UnboundMethod.__init__(self, proxy)
         self.bound = bound
@@ -273,6 +517,30 @@ class BoundMethod(UnboundMethod):
         return self._proxied.infer_call_result(caller, context)
 
 
+# method wrappers in use, keyed on their class and the identity of their
+# function and bound object (which are alive as long as the wrapper is)
+_METHODS = WeakValueDictionary()
+
+def unbound_method(func):
+    """return an UnboundMethod for <func>, the same one while it's in use"""
+    key = (UnboundMethod, id(func), None)
+    try:
+        return _METHODS[key]
+    except KeyError:
+        method = _METHODS[key] = UnboundMethod(func)
+        return method
+
+def bound_method(func, bound):
+    """return a BoundMethod for <func> bound to <bound>, the same one while
+    it's in use"""
+    key = (BoundMethod, id(func), id(bound))
+    try:
+        return _METHODS[key]
+    except KeyError:
+        method = _METHODS[key] = BoundMethod(func, bound)
+        return method
+
+
 class Generator(Instance):
     """a special node representing a generator.
 
@@ -293,6 +561,9 @@ class Generator(Instance):
     def __str__(self):
         return 'Generator(%s)' % (self._proxied.name)
 
+# generators are all represented by this object
+GENERATOR = Generator()
+
 
 # decorators ##################################################################
 
@@ -302,17 +573,22 @@ def path_wrapper(func):
         """wrapper function handling context"""
         if context is None:
             context = InferenceContext()
+        limits = INFERENCE_LIMITS
+        if not limits.check(context):
+            yield YES
+            return
         context.push(node)
+        max_values = limits.max_values
         yielded = set()
         for res in _func(node, context, **kwargs):
-            # unproxy only true instance, not const, tuple, dict...
-            if res.__class__ is Instance:
-                ares = res._proxied
-            else:
-                ares = res
-            if not ares in yielded:
+            # instances of a class are interned (see Class.instanciate_class)
+            if not res in yielded:
+                if max_values is not None and len(yielded) >= max_values:
+                    limits.values_exceeded += 1
+                    yield YES
+                    return
                 yield res
-                yielded.add(ares)
+                yielded.add(res)
     return wrapped
 
 def yes_if_nothing_infered(func):
@@ -357,6 +633,10 @@ class NodeNG(object):
     _astroid_fields = ()
     # instance specific inference function infer(node, context)
     _explicit_inference = None
+    # cached inference results, see InferenceCache
+    _infer_cache = None
+    # (cache epoch, block path), see node_classes._block_path
+    _block_path = None
 
     def infer(self, context=None, **kwargs):
         """main interface to the interface system, return a generator on infered
@@ -364,7 +644,18 @@ class NodeNG(object):
 
         If the instance has some explicit inference function set, it will be
         called instead of the default interface.
+
+        Results are cached when inference starts with an empty inference path.
         """
+        if kwargs or not INFERENCE_CACHE.enabled:
+            return self._infer_uncached(context, **kwargs)
+        if context is not None and context.path:
+            if INFERENCE_CACHE.shared:
+                return INFERENCE_CACHE.infer_shared(self, context)
+            return self._infer_uncached(context)
+        return INFERENCE_CACHE.infer(self, context)
+
+    def _infer_uncached(self, context=None, **kwargs):
         if self._explicit_inference is not None:
             # explicit_inference is not bound, give it self explicitly
             try:
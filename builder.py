@@ -130,14 +130,25 @@ class AstroidBuilder(InspectBuilder):
 
     def string_build(self, data, modname='', path=None):
         """build astroid from source code string and return rebuilded astroid"""
-        module = self._data_build(data, modname, path)
-        self._manager.astroid_cache[module.name] = module
-        # post tree building steps after we stored the module in the cache:
-        for from_node in module._from_nodes:
-            self.add_from_names_to_locals(from_node)
-        # handle delayed assattr nodes
-        for delayed in module._delayed_assattr:
-            self.delayed_assattr(delayed)
+        manager = self._manager
+        manager.build_started()
+        changed = True
+        try:
+            module = self._data_build(data, modname, path)
+            # results may have been computed from a previous tree, or from
+            # failing to import a module built from a string without a file
+            replaced = module.name in manager.astroid_cache or path is None
+            manager.astroid_cache[module.name] = module
+            # post tree building steps after we stored the module in the cache:
+            for from_node in module._from_nodes:
+                self.add_from_names_to_locals(from_node)
+            # handle delayed assattr nodes, which may update other trees
+            updated = False
+            for delayed in module._delayed_assattr:
+                updated = self.delayed_assattr(delayed) or updated
+            changed = replaced or updated
+        finally:
+            manager.build_finished(changed)
         return module
 
     def _data_build(self, data, modname, path):
@@ -184,9 +195,13 @@ class AstroidBuilder(InspectBuilder):
     def delayed_assattr(self, node):
         """visit a AssAttr node -> add name to locals, handle members
         definition
+
+        Return True if nodes of another module have been updated.
         """
+        updated = False
         try:
             frame = node.frame()
+            module = frame.root()
             for infered in node.expr.infer():
                 if infered is YES:
                     continue
@@ -210,6 +225,8 @@ class AstroidBuilder(InspectBuilder):
                 values = iattrs.setdefault(node.attrname, [])
                 if node in values:
                     continue
+                if infered.root() is not module:
+                    updated = True
                 # get assign in __init__ first XXX useful ?
                 if frame.name == '__init__' and values and not \
                        values[0].frame().name == '__init__':
@@ -218,4 +235,5 @@ class AstroidBuilder(InspectBuilder):
                     values.append(node)
         except InferenceError:
             pass
+        return updated
 
@@ -68,7 +68,7 @@ class CallContext:
                         boundnode = funcnode.parent.frame()
                     if funcnode.type == 'method':
                         if not isinstance(boundnode, Instance):
-                            boundnode = Instance(boundnode)
+                            boundnode = boundnode.instanciate_class()
                         return iter((boundnode,))
                     if funcnode.type == 'classmethod':
                         return iter((boundnode,))
@@ -109,9 +109,9 @@ class CallContext:
                 return chain(*its)
         # 5. */** argument, (Tuple or Dict)
         if name == funcnode.args.vararg:
-            return iter((nodes.const_factory(())))
+            return iter((nodes.const_factory(()),))
         if name == funcnode.args.kwarg:
-            return iter((nodes.const_factory({})))
+            return iter((nodes.const_factory({}),))
         # 6. return default value if any
         try:
             return funcnode.args.default_value(name).infer(context)
@@ -193,12 +193,12 @@ def infer_from(self, context=None, asname=True):
     if asname:
         name = self.real_name(name)
     module = self.do_import_module(self.modname)
-    try:
-        context = copy_context(context)
-        context.lookupname = name
-        return _infer_stmts(module.getattr(name, ignore_locals=module is self.root()), context)
-    except NotFoundError:
+    context = copy_context(context)
+    context.lookupname = name
+    stmts = module.lookup_attr(name, ignore_locals=module is self.root())
+    if stmts is None:
         raise InferenceError(name)
+    return _infer_stmts(stmts, context)
 nodes.From._infer = path_wrapper(infer_from)
 
 
@@ -226,10 +226,10 @@ nodes.AssAttr.infer_lhs = raise_if_nothing_infered(infer_getattr) # # won't work
 def infer_global(self, context=None):
     if context.lookupname is None:
         raise InferenceError()
-    try:
-        return _infer_stmts(self.root().getattr(context.lookupname), context)
-    except NotFoundError:
+    stmts = self.root().lookup_attr(context.lookupname)
+    if stmts is None:
         raise InferenceError()
+    return _infer_stmts(stmts, context)
 nodes.Global._infer = path_wrapper(infer_global)
 
 
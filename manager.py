@@ -23,6 +23,7 @@ from various source and using a cache of built modules)
 __docformat__ = "restructuredtext en"
 
 import os
+import zipfile
 from os.path import dirname, join, isdir, exists
 
 from logilab.common.modutils import NoSourceFile, is_python_source, \
@@ -47,6 +48,23 @@ def _silent_no_wrap(func, modname):
     """silent wrapper that doesn't do anything; can be used for tests"""
     return func(modname)
 
+# function run by map_modules worker processes, set when they're started
+_WORKER_FUNC = None
+
+def _init_worker(func):
+    global _WORKER_FUNC
+    _WORKER_FUNC = func
+
+def _map_module((something, is_file)):
+    """build the astroid for a module file if `is_file` is true, else for a
+    module name, and give it to the worker function"""
+    manager = AstroidManager()
+    if is_file:
+        module = manager.ast_from_file(something)
+    else:
+        module = manager.ast_from_module_name(something)
+    return something, _WORKER_FUNC(module)
+
 def safe_repr(obj):
     try:
         return repr(obj)
@@ -84,6 +102,13 @@ class AstroidManager(OptionsProviderMixIn):
             self.astroid_cache = {}
             self._mod_file_cache = {}
             self.transforms = {}
+            # changed each time caches computed on top of astroid trees
+            # (e.g. inference results) have to be dropped
+            self.cache_epoch = 0
+            self._last_epoch = 0
+            # epochs to restore once modules being built are done, None if
+            # caches have been invalidated meanwhile
+            self._building = []
 
     def ast_from_file(self, filepath, modname=None, fallback=True, source=False):
         """given a module name, return the astroid object"""
@@ -134,6 +159,45 @@ class AstroidManager(OptionsProviderMixIn):
         finally:
             os.chdir(old_cwd)
 
+    def invalidate_caches(self, modname=None):
+        """invalidate every cache computed on top of built astroid trees, such
+        as inference results.
+
+        If `modname` is given, its astroid is also removed from the cache so
+        that it will be rebuilt on next access.
+        """
+        if modname is not None:
+            self.astroid_cache.pop(modname, None)
+        self._new_epoch()
+        self._building[:] = [None] * len(self._building)
+
+    def build_started(self):
+        """to be called before building a module: caches computed until
+        `build_finished` is called may rely on its partial tree, so they are
+        given a new epoch
+        """
+        self._building.append(self.cache_epoch)
+        self._new_epoch()
+
+    def build_finished(self, changed):
+        """to be called once a module is built, `changed` telling whether
+        other trees have been updated or replaced by the build.
+
+        Caches computed during the build are dropped. Those computed before
+        are kept unless `changed` is true or caches have been invalidated
+        meanwhile.
+        """
+        epoch = self._building.pop()
+        if changed or epoch is None:
+            self.invalidate_caches()
+        else:
+            self.cache_epoch = epoch
+
+    def _new_epoch(self):
+        # epochs are never reused, since previous ones may be restored
+        self._last_epoch += 1
+        self.cache_epoch = self._last_epoch
+
     def zip_import_data(self, filepath):
         if zipimport is None:
             return None
@@ -156,6 +220,43 @@ class AstroidManager(OptionsProviderMixIn):
                 continue
         return None
 
+    def package_entries(self, directory):
+        """return the names of the modules and packages which may be found in
+        the given package directory, from a single listing of it or of the zip
+        archive holding it, or None if it can't be listed.
+
+        Returned names are a superset of the actual submodules.
+        """
+        if isdir(directory):
+            try:
+                entries = os.listdir(directory)
+            except OSError:
+                return None
+        else:
+            for ext in ('.zip', '.egg'):
+                try:
+                    archive, resource = directory.rsplit(ext + '/', 1)
+                except ValueError:
+                    continue
+                try:
+                    members = zipfile.ZipFile(archive + ext).namelist()
+                except (IOError, zipfile.BadZipfile):
+                    return None
+                prefix = resource + '/'
+                entries = [member[len(prefix):].split('/', 1)[0]
+                           for member in members if member.startswith(prefix)]
+                break
+            else:
+                return None
+        names = set()
+        for entry in entries:
+            name = entry.split('.', 1)[0]
+            names.add(name)
+            # extension modules may be named <name>module.so
+            if name.endswith('module'):
+                names.add(name[:-6])
+        return names
+
     def file_from_module_name(self, modname, contextfile):
         try:
             value = self._mod_file_cache[(modname, contextfile)]
@@ -263,6 +364,46 @@ class AstroidManager(OptionsProviderMixIn):
                     project.add_module(astroid)
         return project
 
+    def map_modules(self, func, modnames, processes=None):
+        """return an iterator on (module name, result) for each module name
+        given in `modnames`, result being returned by `func` called with the
+        module's astroid.
+
+        Modules are handled by a pool of `processes` worker processes (as many
+        as CPUs by default), each one building trees and inferring with its
+        own manager, so results are given as soon as available, in no
+        particular order. They must be picklable, as well as exceptions raised
+        by `func` or when building a module, which are raised when reaching
+        its result. If `processes` is 1, modules are handled by the current
+        process.
+        """
+        return self._map(func, [(modname, False) for modname in modnames],
+                         processes)
+
+    def map_files(self, func, filepaths, processes=None):
+        """return an iterator on (file path, result) for each module file
+        given in `filepaths`, see `map_modules`"""
+        return self._map(func, [(filepath, True) for filepath in filepaths],
+                         processes)
+
+    def _map(self, func, items, processes):
+        if processes == 1:
+            _init_worker(func)
+            return (_map_module(item) for item in items)
+        return self._map_pool(func, items, processes)
+
+    def _map_pool(self, func, items, processes):
+        # multiprocessing is only needed here (and missing from python 2.5)
+        from multiprocessing import Pool
+        pool = Pool(processes, _init_worker, (func,))
+        try:
+            for result in pool.imap_unordered(_map_module, items):
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
     def register_transform(self, node_class, transform, predicate=None):
         """Register `transform(node)` function to be applied on the given
         Astroid's `node_class` if `predicate` is None or return a true value
@@ -293,6 +434,13 @@ class Project:
     def get_module(self, name):
         return self.locals[name]
 
+    def map_modules(self, func, processes=None):
+        """return an iterator on (module file or name, result) for each
+        module of the project, see `AstroidManager.map_modules`"""
+        items = [(module.file or module.name, module.file is not None)
+                 for module in self.modules]
+        return AstroidManager()._map(func, items, processes)
+
     def get_children(self):
         return self.modules
 
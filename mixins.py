@@ -104,7 +104,7 @@ class FromImportMixIn(FilterStmtsMixin):
         except AstroidBuildingException:
             raise InferenceError(modname)
         except SyntaxError, ex:
-            raise InferenceError(str(ex))
+            raise InferenceError(ex)
 
     def real_name(self, asname):
         """get name from 'as' name"""
@@ -20,9 +20,9 @@
 
 import sys
 
-from astroid.exceptions import NoDefault
+from astroid.exceptions import NoDefault, AstroidError
 from astroid.bases import (NodeNG, Statement, Instance, InferenceContext,
-                                 _infer_stmts, YES, BUILTINS)
+                                 _infer_stmts, YES, BUILTINS, MANAGER)
 from astroid.mixins import BlockRangeMixIn, AssignTypeMixin, \
                                  ParentAssignTypeMixin, FromImportMixIn
 
@@ -50,6 +50,39 @@ def unpack_infer(stmt, context=None):
                 yield inf_inf
 
 
+def _block_path(node):
+    """return the block path of <node>: a tuple of (branching node, field,
+    child) for each If or TryExcept node among its ancestors, from the root,
+    child being the ancestor's child holding <node> and field the name of the
+    attribute where it's found.
+
+    Paths are computed from the parent's one and kept on nodes until the
+    manager invalidates its caches.
+    """
+    epoch = MANAGER.cache_epoch
+    # climb up to the first node whose path is known
+    climbed = []
+    while node is not None:
+        cached = node._block_path
+        if cached is not None and cached[0] == epoch:
+            path = cached[1]
+            break
+        climbed.append(node)
+        node = node.parent
+    else:
+        path = ()
+    for child in reversed(climbed):
+        parent = child.parent
+        if isinstance(parent, (If, TryExcept)):
+            try:
+                field = parent.locate_child(child)[0]
+            except AstroidError:
+                field = None
+            path = path + ((parent, field, child),)
+        child._block_path = (epoch, path)
+    return path
+
+
 def are_exclusive(stmt1, stmt2, exceptions=None):
     """return true if the two given statements are mutually exclusive
 
@@ -58,52 +91,83 @@ def are_exclusive(stmt1, stmt2, exceptions=None):
     one of the given exceptions.
 
     algorithm :
-     1) index stmt1's parents
-     2) climb among stmt2's parents until we find a common parent
-     3) if the common parent is a If or TryExcept statement, look if nodes are
-        in exclusive branches
+     1) compare the block paths of the two statements from the root until
+        they differ
+     2) if they differ on the children of a same If or TryExcept statement,
+        this is their common parent: look if nodes are in exclusive branches
     """
-    # index stmt1's parents
-    stmt1_parents = {}
-    children = {}
-    node = stmt1.parent
-    previous = stmt1
-    while node:
-        stmt1_parents[node] = 1
-        children[node] = previous
-        previous = node
-        node = node.parent
-    # climb among stmt2's parents until we find a common parent
-    node = stmt2.parent
-    previous = stmt2
-    while node:
-        if node in stmt1_parents:
-            # if the common parent is a If or TryExcept statement, look if
-            # nodes are in exclusive branches
-            if isinstance(node, If) and exceptions is None:
-                if (node.locate_child(previous)[1]
-                    is not node.locate_child(children[node])[1]):
-                    return True
-            elif isinstance(node, TryExcept):
-                c2attr, c2node = node.locate_child(previous)
-                c1attr, c1node = node.locate_child(children[node])
-                if c1node is not c2node:
-                    if ((c2attr == 'body' and c1attr == 'handlers' and children[node].catch(exceptions)) or
-                        (c2attr == 'handlers' and c1attr == 'body' and previous.catch(exceptions)) or
-                        (c2attr == 'handlers' and c1attr == 'orelse') or
-                        (c2attr == 'orelse' and c1attr == 'handlers')):
-                        return True
-                elif c2attr == 'handlers' and c1attr == 'handlers':
-                    return previous is not children[node]
+    path1 = _block_path(stmt1)
+    path2 = _block_path(stmt2)
+    if path1 is path2:
+        # nodes under the same branches share their path
+        return False
+    for (node, c1attr, child1), (node2, c2attr, child2) in zip(path1, path2):
+        if node is not node2:
+            # the common parent isn't a branching node
             return False
-        previous = node
-        node = node.parent
+        if child1 is child2:
+            continue
+        if c1attr is None or c2attr is None:
+            # inconsistent tree, let locate_child raise the error
+            c1attr = node.locate_child(child1)[0]
+            c2attr = node.locate_child(child2)[0]
+        if isinstance(node, If):
+            return exceptions is None and c1attr != c2attr
+        if c1attr != c2attr:
+            return bool(
+                (c2attr == 'body' and c1attr == 'handlers' and child1.catch(exceptions)) or
+                (c2attr == 'handlers' and c1attr == 'body' and child2.catch(exceptions)) or
+                (c2attr == 'handlers' and c1attr == 'orelse') or
+                (c2attr == 'orelse' and c1attr == 'handlers'))
+        return c2attr == 'handlers'
+    # one of the statement is an ancestor of the other or their common parent
+    # isn't a branching node
     return False
 
 
+class LookupCache(object):
+    """cache of name lookup results, with a global switch and hit / miss
+    counters.
+
+    Results are stored on the node from which the lookup is done, keyed on the
+    looked up name, since they depend on the node's location and not only on
+    its statement (e.g. a name in a function's default arguments or in a
+    class's bases). They are dropped when the manager invalidates its caches,
+    which is done once a module has been built.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def lookup(self, node, name):
+        """return the result of <node>.lookup(<name>), from the cache if
+        possible
+        """
+        cache = node._lookup_cache
+        if cache is None or cache[0] != MANAGER.cache_epoch:
+            cache = node._lookup_cache = (MANAGER.cache_epoch, {})
+        try:
+            result = cache[1][name]
+        except KeyError:
+            self.misses += 1
+            result = cache[1][name] = node._lookup(name)
+        else:
+            self.hits += 1
+        return result
+
+LOOKUP_CACHE = LookupCache()
+
+
 class LookupMixIn(object):
     """Mixin looking up a name in the right scope
     """
+    # (cache epoch, {name: lookup result}), see LookupCache
+    _lookup_cache = None
 
     def lookup(self, name):
         """lookup a variable name
@@ -116,7 +180,21 @@ class LookupMixIn(object):
         the name is found in the inner frame locals, statements will be filtered
         to remove ignorable statements according to self's location
         """
-        return self.scope().scope_lookup(self, name)
+        if LOOKUP_CACHE.enabled:
+            return LOOKUP_CACHE.lookup(self, name)
+        return self._lookup(name)
+
+    def _lookup(self, name):
+        """uncached lookup, answered by the definitions index of self's scope
+        if it has been computed (see `LocalsDictNodeNG.index_definitions`)
+        """
+        scope = self.scope()
+        definitions = scope._definitions
+        if definitions is not None and definitions[0] == MANAGER.cache_epoch:
+            result = definitions[1].get(self)
+            if result is not None and self.name == name:
+                return result
+        return scope.scope_lookup(self, name)
 
     def ilookup(self, name):
         """infered lookup
@@ -128,12 +206,15 @@ class LookupMixIn(object):
         context = InferenceContext()
         return _infer_stmts(stmts, context, frame)
 
-    def _filter_stmts(self, stmts, frame, offset):
+    def _filter_stmts(self, stmts, frame, offset, name=None):
         """filter statements to remove ignorable statements.
 
         If self is not a frame itself and the name is found in the inner
         frame locals, statements will be filtered to remove ignorable
         statements according to self's location
+
+        If the looked up `name` is given, the frame's bindings index is used to
+        skip statements which are necessarily hidden by a later assignment.
         """
         # if offset == -1, my actual frame is not the inner frame but its parent
         #
@@ -157,6 +238,10 @@ class LookupMixIn(object):
         else:
             # disabling lineno filtering
             mylineno = 0
+        if mylineno > 0 and name is not None:
+            start = frame._lookup_start(name, stmts, mystmt)
+            if start:
+                stmts = stmts[start:]
         _stmts = []
         _stmt_parents = []
         for node in stmts:
@@ -164,74 +249,83 @@ class LookupMixIn(object):
             # line filtering is on and we have reached our location, break
             if mylineno > 0 and stmt.fromlineno > mylineno:
                 break
-            assert hasattr(node, 'ass_type'), (node, node.scope(),
-                                               node.scope().locals)
-            ass_type = node.ass_type()
-
-            if node.has_base(self):
-                break
-
-            _stmts, done = ass_type._get_filtered_stmts(self, node, _stmts, mystmt)
+            _stmts, _stmt_parents, done = self._filter_stmt(
+                node, stmt, mystmt, _stmts, _stmt_parents)
             if done:
                 break
+        return _stmts
 
-            optional_assign = ass_type.optional_assign
-            if optional_assign and ass_type.parent_of(self):
-                # we are inside a loop, loop var assigment is hidding previous
-                # assigment
-                _stmts = [node]
-                _stmt_parents = [stmt.parent]
-                continue
+    def _filter_stmt(self, node, stmt, mystmt, _stmts, _stmt_parents):
+        """update the statements <_stmts> (and their parents <_stmt_parents>)
+        reaching self in <mystmt> given the following binding <node> of the
+        looked up name in <stmt>.
 
-            # XXX comment various branches below!!!
-            try:
-                pindex = _stmt_parents.index(stmt.parent)
-            except ValueError:
-                pass
-            else:
-                # we got a parent index, this means the currently visited node
-                # is at the same block level as a previously visited node
-                if _stmts[pindex].ass_type().parent_of(ass_type):
-                    # both statements are not at the same block level
-                    continue
-                # if currently visited node is following previously considered
-                # assignement and both are not exclusive, we can drop the
-                # previous one. For instance in the following code ::
-                #
-                #   if a:
-                #     x = 1
-                #   else:
-                #     x = 2
-                #   print x
-                #
-                # we can't remove neither x = 1 nor x = 2 when looking for 'x'
-                # of 'print x'; while in the following ::
-                #
-                #   x = 1
-                #   x = 2
-                #   print x
-                #
-                # we can remove x = 1 when we see x = 2
-                #
-                # moreover, on loop assignment types, assignment won't
-                # necessarily be done if the loop has no iteration, so we don't
-                # want to clear previous assigments if any (hence the test on
-                # optional_assign)
-                if not (optional_assign or are_exclusive(_stmts[pindex], node)):
-                    del _stmt_parents[pindex]
-                    del _stmts[pindex]
-            if isinstance(node, AssName):
-                if not optional_assign and stmt.parent is mystmt.parent:
-                    _stmts = []
-                    _stmt_parents = []
-            elif isinstance(node, DelName):
+        Return a 3-uple (statements, parents, done), done being true when no
+        other bindings have to be considered.
+        """
+        assert hasattr(node, 'ass_type'), (node, node.scope(),
+                                           node.scope().locals)
+        ass_type = node.ass_type()
+
+        if node.has_base(self):
+            return _stmts, _stmt_parents, True
+
+        _stmts, done = ass_type._get_filtered_stmts(self, node, _stmts, mystmt)
+        if done:
+            return _stmts, _stmt_parents, True
+
+        optional_assign = ass_type.optional_assign
+        if optional_assign and ass_type.parent_of(self):
+            # we are inside a loop, loop var assigment is hidding previous
+            # assigment
+            return [node], [stmt.parent], False
+
+        # XXX comment various branches below!!!
+        # (test membership first: the ValueError raised by list.index formats
+        # the repr of the missing node)
+        if stmt.parent in _stmt_parents:
+            pindex = _stmt_parents.index(stmt.parent)
+            # we got a parent index, this means the currently visited node
+            # is at the same block level as a previously visited node
+            if _stmts[pindex].ass_type().parent_of(ass_type):
+                # both statements are not at the same block level
+                return _stmts, _stmt_parents, False
+            # if currently visited node is following previously considered
+            # assignement and both are not exclusive, we can drop the
+            # previous one. For instance in the following code ::
+            #
+            #   if a:
+            #     x = 1
+            #   else:
+            #     x = 2
+            #   print x
+            #
+            # we can't remove neither x = 1 nor x = 2 when looking for 'x'
+            # of 'print x'; while in the following ::
+            #
+            #   x = 1
+            #   x = 2
+            #   print x
+            #
+            # we can remove x = 1 when we see x = 2
+            #
+            # moreover, on loop assignment types, assignment won't
+            # necessarily be done if the loop has no iteration, so we don't
+            # want to clear previous assigments if any (hence the test on
+            # optional_assign)
+            if not (optional_assign or are_exclusive(_stmts[pindex], node)):
+                del _stmt_parents[pindex]
+                del _stmts[pindex]
+        if isinstance(node, AssName):
+            if not optional_assign and stmt.parent is mystmt.parent:
                 _stmts = []
                 _stmt_parents = []
-                continue
-            if not are_exclusive(self, node):
-                _stmts.append(node)
-                _stmt_parents.append(stmt.parent)
-        return _stmts
+        elif isinstance(node, DelName):
+            return [], [], False
+        if not are_exclusive(self, node):
+            _stmts.append(node)
+            _stmt_parents.append(stmt.parent)
+        return _stmts, _stmt_parents, False
 
 # Name classes
 
@@ -845,6 +939,59 @@ class Tuple(NodeNG, Instance, ParentAssignTypeMixin):
         return self.elts
 
 
+class RepeatedSequenceMixIn(object):
+    """mixin for List and Tuple nodes inferred from the repetition of a
+    sequence (e.g. `[0] * n`): the repeated elements and the number of
+    repetitions are stored instead of every element, which are only built by
+    `expand` (hence when `elts` is accessed)
+    """
+
+    def __init__(self, base, count):
+        self.base = base
+        self.count = max(count, 0)
+
+    @property
+    def elts(self):
+        return self.expand()
+
+    def expand(self):
+        """return the list of every element of the sequence"""
+        return self.base * self.count
+
+    def getitem(self, index, context=None):
+        if not isinstance(index, (int, long)):
+            return self.expand()[index]
+        length = len(self.base) * self.count
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+        return self.base[index % len(self.base)]
+
+    def itered(self):
+        return (elt for _ in xrange(self.count) for elt in self.base)
+
+    def distinct_items(self):
+        """return elements of the sequence, repeated ones only once"""
+        if self.count:
+            return iter(self.base)
+        return iter(())
+
+    def accept(self, visitor):
+        # visited as a plain list or tuple
+        if isinstance(self, Tuple):
+            return visitor.visit_tuple(self)
+        return visitor.visit_list(self)
+
+
+class RepeatedList(RepeatedSequenceMixIn, List):
+    """class representing a List inferred from the repetition of a list"""
+
+
+class RepeatedTuple(RepeatedSequenceMixIn, Tuple):
+    """class representing a Tuple inferred from the repetition of a tuple"""
+
+
 class UnaryOp(NodeNG):
     """class representing an UnaryOp node"""
     _astroid_fields = ('operand',)
@@ -0,0 +1,264 @@
+# copyright 2003-2013 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""this module contains a profiler of the inference, giving its cost by node
+class and by source location.
+
+Usage::
+
+  profiler = InferenceProfiler()
+  profiler.install()
+  try:
+      ... # some inference
+  finally:
+      profiler.uninstall()
+  profiler.dump(open('profile.json', 'w'))
+
+The inference cache is disabled while the profiler is installed, so that the
+cost of inferences whose results would otherwise have been replayed from the
+cache is recorded.
+"""
+
+__docformat__ = "restructuredtext en"
+
+from heapq import heappush, heapreplace
+from time import time
+
+from astroid.bases import INFERENCE_CACHE
+from astroid.nodes import ALL_NODE_CLASSES
+
+
+class _Stats(object):
+    """cost of the inferences sharing a node class or a source location"""
+    __slots__ = ('calls', 'cumtime', 'selftime', 'values', 'exceptions')
+
+    def __init__(self):
+        self.calls = 0
+        self.cumtime = 0.
+        self.selftime = 0.
+        self.values = 0
+        self.exceptions = 0
+
+    def as_dict(self):
+        return dict((attr, getattr(self, attr)) for attr in self.__slots__)
+
+
+class _Call(object):
+    """a call to an inference function, running until its values have all
+    been generated
+    """
+    __slots__ = ('keys', 'parent', 'time', 'slowest_child')
+
+    def __init__(self, keys, parent):
+        self.keys = keys
+        self.parent = parent
+        self.time = 0.
+        self.slowest_child = None
+
+    def chain(self):
+        """return the descriptions of this call and of its slowest
+        descendants"""
+        chain = []
+        call = self
+        while call is not None:
+            chain.append('%s %s' % call.keys)
+            call = call.slowest_child
+        return chain
+
+
+class InferenceProfiler(object):
+    """profiler of the `_infer` functions installed on node classes.
+
+    Calls, cumulative and self time, generated values and raised exceptions
+    are recorded by node class and by source location ("module:line"), along
+    with the `slowest` inferences started outside of any other profiled
+    inference and the chain of their slowest nested inferences.
+
+    The time spent to generate values is only accounted while the consumer of
+    the values is waiting for them, so that inferences interleaved by lazy
+    generators aren't mixed up.
+    """
+
+    def __init__(self, slowest=10):
+        self.nslowest = slowest
+        self._originals = None
+        self._cache_enabled = None
+        self.reset()
+
+    def reset(self):
+        """drop the recorded statistics"""
+        self.node_classes = {}
+        self.locations = {}
+        # heap of (time, chain) of the slowest top level inferences
+        self.slowest = []
+        # calls currently generating a value, innermost last
+        self._stack = []
+        self._segments = []
+        self._running = {}
+
+    def install(self):
+        """wrap the inference function of each node class and disable the
+        inference cache, which is used before calling them
+        """
+        if self._originals is not None:
+            return
+        self._cache_enabled = INFERENCE_CACHE.enabled
+        INFERENCE_CACHE.enabled = False
+        self._originals = {}
+        # get every function before replacing any of them, so that inherited
+        # functions are only wrapped once
+        for klass in ALL_NODE_CLASSES:
+            self._originals[klass] = (klass.__dict__.get('_infer'),
+                                      _inference_function(klass))
+        for klass, (_, func) in self._originals.items():
+            klass._infer = self._wrap(func)
+
+    def uninstall(self):
+        """restore the original inference functions and the inference cache
+        """
+        if self._originals is None:
+            return
+        for klass, (own, _) in self._originals.items():
+            if own is None:
+                del klass._infer
+            else:
+                klass._infer = own
+        self._originals = None
+        INFERENCE_CACHE.enabled = self._cache_enabled
+
+    def _wrap(self, func):
+        profiler = self
+        def _infer(node, context=None, **kwargs):
+            return profiler._profile(func, node, context, kwargs)
+        return _infer
+
+    def _profile(self, func, node, context, kwargs):
+        location = '%s:%s' % (node.root().name, node.fromlineno)
+        keys = (node.__class__.__name__, location)
+        if self._stack:
+            call = _Call(keys, self._stack[-1])
+        else:
+            call = _Call(keys, None)
+        self._stats(self.node_classes, keys[0]).calls += 1
+        self._stats(self.locations, keys[1]).calls += 1
+        # inference functions may fail before generating anything
+        self._enter(call)
+        try:
+            iterator = iter(func(node, context, **kwargs))
+        except Exception:
+            self._leave(call)
+            self._finish(call, 0, 1)
+            raise
+        self._leave(call)
+        return self._generate(iterator, call)
+
+    def _generate(self, iterator, call):
+        values = exceptions = 0
+        try:
+            while True:
+                self._enter(call)
+                try:
+                    value = iterator.next()
+                except StopIteration:
+                    self._leave(call)
+                    return
+                except GeneratorExit:
+                    self._leave(call)
+                    raise
+                except Exception:
+                    self._leave(call)
+                    exceptions = 1
+                    raise
+                self._leave(call)
+                values += 1
+                yield value
+        finally:
+            self._finish(call, values, exceptions)
+
+    def _enter(self, call):
+        self._stack.append(call)
+        # start of the call, time spent in nested calls
+        self._segments.append([time(), 0.])
+        for key in call.keys:
+            self._running[key] = self._running.get(key, 0) + 1
+
+    def _leave(self, call):
+        self._stack.pop()
+        started, nested = self._segments.pop()
+        elapsed = time() - started
+        call.time += elapsed
+        if self._segments:
+            self._segments[-1][1] += elapsed
+        running = self._running
+        for stats, key in zip((self.node_classes, self.locations), call.keys):
+            running[key] -= 1
+            # time of recursive calls is already accounted by the outer one
+            if not running[key]:
+                stats[key].cumtime += elapsed
+            stats[key].selftime += elapsed - nested
+
+    def _finish(self, call, values, exceptions):
+        for stats, key in zip((self.node_classes, self.locations), call.keys):
+            stats[key].values += values
+            stats[key].exceptions += exceptions
+        parent = call.parent
+        if parent is not None:
+            slowest = parent.slowest_child
+            if slowest is None or slowest.time < call.time:
+                parent.slowest_child = call
+        elif self.nslowest:
+            entry = (call.time, call.chain())
+            if len(self.slowest) < self.nslowest:
+                heappush(self.slowest, entry)
+            elif self.slowest[0] < entry:
+                heapreplace(self.slowest, entry)
+
+    def _stats(self, stats, key):
+        try:
+            return stats[key]
+        except KeyError:
+            stats[key] = _Stats()
+            return stats[key]
+
+    def stats(self):
+        """return recorded statistics as a dictionary, made of builtin types
+        only"""
+        return {
+            'node_classes': dict((key, stats.as_dict())
+                                 for key, stats in self.node_classes.items()),
+            'locations': dict((key, stats.as_dict())
+                              for key, stats in self.locations.items()),
+            'slowest': [{'time': duration, 'chain': chain}
+                        for duration, chain in sorted(self.slowest,
+                                                      reverse=True)],
+            }
+
+    def dump(self, stream):
+        """write recorded statistics to the given stream as JSON"""
+        try:
+            import json
+        except ImportError: # python < 2.6
+            import simplejson as json
+        json.dump(self.stats(), stream, indent=1, sort_keys=True)
+
+
+def _inference_function(klass):
+    """return the function used to infer instances of the given class"""
+    for base in klass.__mro__:
+        if '_infer' in base.__dict__:
+            return base.__dict__['_infer']
+    raise AttributeError('_infer')
@@ -22,7 +22,7 @@ where it makes sense.
 __doctype__ = "restructuredtext en"
 
 from astroid.exceptions import InferenceError, NoDefault
-from astroid.node_classes import unpack_infer
+from astroid.node_classes import unpack_infer, RepeatedList, RepeatedTuple
 from astroid.bases import copy_context, \
      raise_if_nothing_infered, yes_if_nothing_infered, Instance, YES
 from astroid.nodes import const_factory
@@ -38,6 +38,14 @@ nodes.Tuple.infer_unary_op = tl_infer_unary_op
 nodes.List.infer_unary_op = tl_infer_unary_op
 
 
+def repeated_infer_unary_op(self, operator):
+    if operator == 'not':
+        return const_factory(not (self.base and self.count))
+    raise TypeError() # XXX log unsupported operation
+RepeatedTuple.infer_unary_op = repeated_infer_unary_op
+RepeatedList.infer_unary_op = repeated_infer_unary_op
+
+
 def dict_infer_unary_op(self, operator):
     if operator == 'not':
         return const_factory(not bool(self.items))
@@ -74,12 +82,51 @@ BIN_OP_IMPL = {'+':  lambda a, b: a + b,
 for key, impl in BIN_OP_IMPL.items():
     BIN_OP_IMPL[key+'='] = impl
 
+# maximum size of values computed by binary operations on constants, in items
+# for strings and tuples and in bytes for integers. YES is inferred instead of
+# larger values, which would take too much time or memory to compute.
+MAX_CONST_SIZE = 10 ** 7
+
+def _int_size(value):
+    # int.bit_length is only available from python 2.7
+    return len('%x' % abs(value)) // 2 + 1
+
+def _sequence_mul_size(sequence, count):
+    if isinstance(sequence, (basestring, tuple, list)) and \
+           isinstance(count, (int, long)):
+        return len(sequence) * count
+    return 0
+
+def binary_op_size(operator, left, right):
+    """return an estimate of the size of `left <operator> right`, as defined
+    for MAX_CONST_SIZE, for operations whose result may be much larger than
+    their operands (0 for others)
+    """
+    operator = operator.rstrip('=')
+    if operator == '*':
+        if isinstance(left, (int, long)) and isinstance(right, (int, long)):
+            return _int_size(left) + _int_size(right)
+        return max(_sequence_mul_size(left, right),
+                   _sequence_mul_size(right, left))
+    if not (isinstance(left, (int, long)) and isinstance(right, (int, long))):
+        return 0
+    if operator == '**':
+        if right > 0 and abs(left) > 1:
+            return _int_size(left) * right
+    elif operator == '<<':
+        if right > 0:
+            return _int_size(left) + right // 8
+    return 0
+
 def const_infer_binary_op(self, operator, other, context):
     for other in other.infer(context):
         if isinstance(other, nodes.Const):
             try:
                 impl = BIN_OP_IMPL[operator]
-
+                if (binary_op_size(operator, self.value, other.value)
+                        > MAX_CONST_SIZE):
+                    yield YES
+                    continue
                 try:
                     yield const_factory(impl(self.value, other.value))
                 except Exception:
@@ -101,12 +148,16 @@ nodes.Const.infer_binary_op = yes_if_nothing_infered(const_infer_binary_op)
 
 
 def tl_infer_binary_op(self, operator, other, context):
+    if isinstance(self, nodes.Tuple):
+        klass, repeated_klass = nodes.Tuple, RepeatedTuple
+    else:
+        klass, repeated_klass = nodes.List, RepeatedList
     for other in other.infer(context):
-        if isinstance(other, self.__class__) and operator == '+':
-            node = self.__class__()
-            elts = [n for elt in self.elts for n in elt.infer(context)
+        if isinstance(other, klass) and operator == '+':
+            node = klass()
+            elts = [n for elt in self.itered() for n in elt.infer(context)
                     if not n is YES]
-            elts += [n for elt in other.elts for n in elt.infer(context)
+            elts += [n for elt in other.itered() for n in elt.infer(context)
                      if not n is YES]
             node.elts = elts
             yield node
@@ -114,11 +165,18 @@ def tl_infer_binary_op(self, operator, other, context):
             if not isinstance(other.value, int):
                 yield YES
                 continue
-            node = self.__class__()
-            elts = [n for elt in self.elts for n in elt.infer(context)
-                    if not n is YES] * other.value
-            node.elts = elts
-            yield node
+            if isinstance(self, repeated_klass):
+                # elements of a repeated sequence are already inferred
+                base, count = self.base, self.count * other.value
+            else:
+                base = [n for elt in self.elts for n in elt.infer(context)
+                        if not n is YES]
+                count = other.value
+            if len(base) * count > MAX_CONST_SIZE:
+                yield YES
+                continue
+            # don't build every element of the sequence
+            yield repeated_klass(base, count)
         elif isinstance(other, Instance) and not isinstance(other, nodes.Const):
             yield YES
     # XXX else log TypeError
@@ -147,6 +205,14 @@ The `context` argument is the current inference context which should be given
 to any intermediary inference necessary.
 """
 
+def _loop_items(sequence):
+    """return items a loop on <sequence> may assign, once for repeated
+    sequences since they would give the same values
+    """
+    if isinstance(sequence, (RepeatedList, RepeatedTuple)):
+        return sequence.distinct_items()
+    return sequence.itered()
+
 def _resolve_looppart(parts, asspath, context):
     """recursive function to resolve multiple assignments on loops"""
     asspath = asspath[:]
@@ -158,7 +224,7 @@ def _resolve_looppart(parts, asspath, context):
         if not hasattr(part, 'itered'):
             continue
         try:
-            itered = part.itered()
+            itered = _loop_items(part)
         except TypeError:
             continue # XXX log error
         for stmt in itered:
@@ -189,7 +255,7 @@ def for_assigned_stmts(self, node, context=None, asspath=None):
     if asspath is None:
         for lst in self.iter.infer(context):
             if isinstance(lst, (nodes.Tuple, nodes.List)):
-                for item in lst.elts:
+                for item in _loop_items(lst):
                     yield item
     else:
         for infered in _resolve_looppart(self.iter.infer(context),
@@ -225,7 +291,7 @@ def _arguments_infer_argname(self, name, context):
     if self.args and getattr(self.args[0], 'name', None) == name:
         functype = self.parent.type
         if functype == 'method':
-            yield Instance(self.parent.parent.frame())
+            yield self.parent.parent.frame().instanciate_class()
             return
         if functype == 'classmethod':
             yield self.parent.parent.frame()
@@ -303,7 +369,7 @@ def _resolve_asspart(parts, asspath, context):
 def excepthandler_assigned_stmts(self, node, context=None, asspath=None):
     for assigned in unpack_infer(self.type):
         if isinstance(assigned, nodes.Class):
-            assigned = Instance(assigned)
+            assigned = assigned.instanciate_class()
         yield assigned
 nodes.ExceptHandler.assigned_stmts = raise_if_nothing_infered(excepthandler_assigned_stmts)
 
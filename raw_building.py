@@ -217,10 +217,16 @@ class InspectBuilder(object):
             # in jython, java modules have no __doc__ (see #109562)
             node = build_module(modname)
         node.file = node.path = path and abspath(path) or path
-        MANAGER.astroid_cache[modname] = node
-        node.package = hasattr(module, '__path__')
-        self._done = {}
-        self.object_build(node, module)
+        MANAGER.build_started()
+        # results may have been computed from a previous tree
+        replaced = modname in MANAGER.astroid_cache
+        try:
+            MANAGER.astroid_cache[modname] = node
+            node.package = hasattr(module, '__path__')
+            self._done = {}
+            self.object_build(node, module)
+        finally:
+            MANAGER.build_finished(replaced)
         return node
 
     def object_build(self, node, obj):
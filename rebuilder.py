@@ -128,6 +128,8 @@ class TreeRebuilder(object):
         self._from_nodes = []
         self._delayed_assattr = []
         self._visit_meths = {}
+        # Function / Lambda nodes being built, innermost last
+        self._functions = []
 
     def _transform(self, node):
         try:
@@ -497,7 +499,10 @@ class TreeRebuilder(object):
         _lineno_parent(node, newnode, parent)
         _init_set_doc(node, newnode)
         newnode.args = self.visit(node.args, newnode)
+        newnode._returns, newnode._yields = [], []
+        self._functions.append(newnode)
         newnode.body = [self.visit(child, newnode) for child in node.body]
+        self._functions.pop()
         if 'decorators' in node._fields: # py < 2.6
             attr = 'decorators'
         else:
@@ -614,7 +619,10 @@ class TreeRebuilder(object):
         newnode = new.Lambda()
         _lineno_parent(node, newnode, parent)
         newnode.args = self.visit(node.args, newnode)
+        newnode._returns, newnode._yields = [], []
+        self._functions.append(newnode)
         newnode.body = self.visit(node.body, newnode)
+        self._functions.pop()
         newnode.set_line_info(newnode.last_child())
         return newnode
 
@@ -714,6 +722,8 @@ class TreeRebuilder(object):
         if node.value is not None:
             newnode.value = self.visit(node.value, newnode)
         newnode.set_line_info(newnode.last_child())
+        if self._functions:
+            self._functions[-1]._returns.append(newnode)
         return newnode
 
     def visit_set(self, node, parent):
@@ -826,6 +836,8 @@ class TreeRebuilder(object):
         if node.value is not None:
             newnode.value = self.visit(node.value, newnode)
         newnode.set_line_info(newnode.last_child())
+        if self._functions:
+            self._functions[-1]._yields.append(newnode)
         return newnode
 
 
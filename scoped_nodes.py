@@ -24,19 +24,22 @@ from __future__ import with_statement
 __doctype__ = "restructuredtext en"
 
 import sys
-from itertools import chain
+from os.path import basename, dirname
+from bisect import bisect_left
+from collections import deque
 
 from logilab.common.compat import builtins
 from logilab.common.decorators import cached
 
 from astroid.exceptions import NotFoundError, \
      AstroidBuildingException, InferenceError
-from astroid.node_classes import Const, DelName, DelAttr, \
-     Dict, From, List, Pass, Raise, Return, Tuple, Yield, \
-     LookupMixIn, const_factory as cf, unpack_infer
+from astroid.node_classes import AssName, AugAssign, CallFunc, Const, \
+     DelName, DelAttr, Dict, From, Getattr, List, Name, Pass, Raise, Return, \
+     Tuple, Yield, LookupMixIn, const_factory as cf, unpack_infer
 from astroid.bases import NodeNG, InferenceContext, Instance,\
-     YES, Generator, UnboundMethod, BoundMethod, _infer_stmts, copy_context, \
-     BUILTINS
+     YES, GENERATOR, UnboundMethod, BoundMethod, unbound_method, \
+     bound_method, _infer_stmts, copy_context, \
+     BUILTINS, INFERENCE_CACHE, INFERENCE_LIMITS
 from astroid.mixins import FilterStmtsMixin
 from astroid.bases import Statement
 from astroid.manager import AstroidManager
@@ -54,9 +57,9 @@ def remove_nodes(func, cls):
 def function_to_method(n, klass):
     if isinstance(n, Function):
         if n.type == 'classmethod':
-            return BoundMethod(n, klass)
+            return bound_method(n, klass)
         if n.type != 'staticmethod':
-            return UnboundMethod(n)
+            return unbound_method(n)
     return n
 
 def std_special_attributes(self, name, add_locals=True):
@@ -73,19 +76,89 @@ def std_special_attributes(self, name, add_locals=True):
     raise NotFoundError(name)
 
 MANAGER = AstroidManager()
+
+# (cache epoch, builtins module astroid, {name: statements}), see
+# _builtins_table
+_BUILTINS_TABLE = None
+
+def _builtins_table():
+    """return the builtins symbol table, made once the builtins module astroid
+    is built and kept until the manager invalidates its caches
+    """
+    global _BUILTINS_TABLE
+    table = _BUILTINS_TABLE
+    if table is None or table[0] != MANAGER.cache_epoch:
+        builtin_astroid = MANAGER.ast_from_module(builtins)
+        symbols = dict(builtin_astroid.locals)
+        symbols.pop('__dict__', None)
+        table = _BUILTINS_TABLE = (MANAGER.cache_epoch, builtin_astroid,
+                                   symbols)
+    return table
+
 def builtin_lookup(name):
     """lookup a name into the builtin module
     return the list of matching statements and the astroid for the builtin
     module
     """
-    builtin_astroid = MANAGER.ast_from_module(builtins)
-    if name == '__dict__':
-        return builtin_astroid, ()
-    try:
-        stmts = builtin_astroid.locals[name]
-    except KeyError:
-        stmts = ()
-    return builtin_astroid, stmts
+    _, builtin_astroid, symbols = _builtins_table()
+    return builtin_astroid, symbols.get(name, ())
+
+def is_builtin_name(name):
+    """return True if <name> is defined in the builtin module"""
+    return name in _builtins_table()[2]
+
+
+class _BindingIndex(object):
+    """line ordered index of the statements binding a name in a scope
+
+    For each binding we keep the line of its statement and, for bindings
+    which unconditionally rebind the name in their block (i.e. plain
+    assignments), the line and position of the binding grouped by block. A
+    lookup at a given line can then binary search the last of those
+    "barriers" in its own block: previous bindings are necessarily hidden.
+    """
+    __slots__ = ('stmts', 'size', 'ordered', 'barriers')
+
+    def __init__(self, stmts):
+        self.stmts = stmts
+        self.size = len(stmts)
+        # block (the parent of the binding statement) -> ([lines], [positions])
+        self.barriers = {}
+        previous = 0
+        ordered = True
+        for position, node in enumerate(stmts):
+            stmt = node.statement()
+            lineno = stmt.fromlineno
+            if lineno is None or lineno < previous:
+                # nodes inserted for living objects or out of order bindings,
+                # can't use the index
+                ordered = False
+                break
+            previous = lineno
+            if (isinstance(node, AssName)
+                and not node.ass_type().optional_assign):
+                lines, positions = self.barriers.setdefault(stmt.parent,
+                                                            ([], []))
+                lines.append(lineno)
+                positions.append(position)
+        self.ordered = ordered
+
+    def is_valid(self, stmts):
+        """return True if the index is still up to date with <stmts>"""
+        return self.stmts is stmts and self.size == len(stmts)
+
+    def start(self, mystmt):
+        """return the position of the last binding which hides every previous
+        ones for a lookup from <mystmt>
+        """
+        try:
+            lines, positions = self.barriers[mystmt.parent]
+        except KeyError:
+            return 0
+        index = bisect_left(lines, mystmt.fromlineno)
+        if index:
+            return positions[index - 1]
+        return 0
 
 
 # TODO move this Mixin to mixins.py; problem: 'Function' in _scope_lookup
@@ -120,22 +193,204 @@ class LocalsDictNodeNG(LookupMixIn, NodeNG):
         return self
 
 
+    # name -> _BindingIndex, lazily built since locals may be updated once the
+    # tree has been rebuilt (from imports, delayed attributes, transforms...)
+    _binding_indexes = None
+
+    def _binding_index(self, name, stmts):
+        """return the up to date _BindingIndex of <stmts>, the bindings of
+        <name> in this scope
+        """
+        if self._binding_indexes is None:
+            self._binding_indexes = {}
+        index = self._binding_indexes.get(name)
+        if index is None or not index.is_valid(stmts):
+            index = self._binding_indexes[name] = _BindingIndex(stmts)
+        return index
+
+    def _lookup_start(self, name, stmts, mystmt):
+        """return the position in <stmts>, the bindings of <name> in this
+        scope, from which a lookup from statement <mystmt> has to filter them
+        """
+        index = self._binding_index(name, stmts)
+        if not index.ordered:
+            return 0
+        return index.start(mystmt)
+
+    # (cache epoch, {name node: lookup result}), see index_definitions
+    _definitions = None
+
+    def index_definitions(self):
+        """compute at once the lookup result of every name used, assigned or
+        deleted in this scope and its nested scopes, instead of filtering the
+        bindings of the name for each of them. Lookups from those nodes are then
+        answered from the index until the manager's caches are invalidated.
+        """
+        uses = {}
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, (Name, AssName, DelName)):
+                uses.setdefault(node.scope(), []).append(node)
+            nodes.extend(node.get_children())
+        epoch = MANAGER.cache_epoch
+        for scope, names in uses.iteritems():
+            scope._definitions = (epoch, scope._reaching_definitions(names))
+
+    def _reaching_definitions(self, names):
+        """return a dictionary mapping name nodes of <names>, whose scope is
+        this one, to their lookup result
+        """
+        definitions = {}
+        uses = {}
+        for node in names:
+            mystmt = node.statement()
+            if (mystmt is self or not mystmt.fromlineno
+                    or node.frame() is not self
+                    or mystmt.parent.frame() is not self
+                    or not node.name in self.locals):
+                # function defaults, class bases, decorators, nested lambda or
+                # generator expression, living object or name not found locally
+                definitions[node] = self.scope_lookup(node, node.name)
+                continue
+            # statements from the frame's body down to the node's statement
+            chain = [mystmt]
+            while chain[-1].parent is not self:
+                chain.append(chain[-1].parent)
+            chain.reverse()
+            uses.setdefault(node.name, []).append((node, chain))
+        fields = {}
+        for name, nodes in uses.iteritems():
+            stmts = self.locals[name]
+            if self._binding_index(name, stmts).ordered:
+                self._sweep_block(stmts, nodes, 0, [], [], 0, definitions,
+                                  fields)
+            else:
+                for node, _ in nodes:
+                    definitions[node] = self.scope_lookup(node, name)
+        return definitions
+
+    def _sweep_block(self, stmts, uses, depth, _stmts, _stmt_parents, start,
+                     definitions, fields):
+        """resolve <uses>, (name node, statements chain) of a same name within
+        a same block, the statements at <depth> in their chain, given the
+        statements (and their parents) reaching the block once the ordered
+        bindings <stmts> up to <start> have been filtered.
+
+        Bindings before a use's line affect the statements reaching it the same
+        way for every use directly in the block, so they're filtered once for
+        all of them. This is also true for uses in nested blocks but for plain
+        assignments of this block, so a second state is kept for those, which
+        is given to the nested blocks of each statement.
+        """
+        size = len(stmts)
+        direct = []
+        nested = {}
+        for use in uses:
+            chain = use[1]
+            if len(chain) == depth + 1:
+                direct.append(use)
+                continue
+            parent, child = chain[depth], chain[depth + 1]
+            if not child in fields:
+                for field in parent._astroid_fields:
+                    value = getattr(parent, field)
+                    if isinstance(value, (list, tuple)):
+                        for node in value:
+                            fields[node] = field
+                    elif value is not None:
+                        fields[value] = field
+            nested.setdefault((parent, fields[child]), []).append(use)
+        direct.sort(key=lambda use: use[1][-1].fromlineno)
+        state = (_stmts[:], _stmt_parents[:])
+        position = start
+        for node, chain in direct:
+            mystmt = chain[-1]
+            lineno = mystmt.fromlineno
+            while position < size:
+                stmt = stmts[position].statement()
+                if stmt.fromlineno >= lineno:
+                    break
+                state = node._filter_stmt(stmts[position], stmt, mystmt,
+                                          *state)[:2]
+                position += 1
+            # bindings on the use's line depend on the use itself
+            reaching, parents = state[0][:], state[1][:]
+            for index in xrange(position, size):
+                stmt = stmts[index].statement()
+                if stmt.fromlineno > lineno:
+                    break
+                reaching, parents, done = node._filter_stmt(
+                    stmts[index], stmt, mystmt, reaching, parents)
+                if done:
+                    break
+            if reaching:
+                definitions[node] = (self, reaching)
+            else:
+                definitions[node] = self._outer_lookup(node, node.name)
+        blocks = sorted(nested.iteritems(),
+                        key=lambda item: item[0][0].fromlineno)
+        state = (_stmts[:], _stmt_parents[:])
+        position = start
+        for (parent, _), block_uses in blocks:
+            node, chain = block_uses[0]
+            lineno = parent.fromlineno
+            while position < size:
+                stmt = stmts[position].statement()
+                if stmt.fromlineno >= lineno:
+                    break
+                state = node._filter_stmt(stmts[position], stmt, chain[-1],
+                                          *state)[:2]
+                position += 1
+            self._sweep_block(stmts, block_uses, depth + 1, state[0], state[1],
+                              position, definitions, fields)
+
     def _scope_lookup(self, node, name, offset=0):
         """XXX method for interfacing the scope lookup"""
         try:
-            stmts = node._filter_stmts(self.locals[name], self, offset)
+            stmts = node._filter_stmts(self.locals[name], self, offset, name)
         except KeyError:
             stmts = ()
         if stmts:
             return self, stmts
+        return self._outer_lookup(node, name)
+
+    # (cache epoch, {free name: enclosing scope binding it}), see _outer_lookup
+    _free_names = None
+
+    def _outer_lookup(self, node, name):
+        """lookup <name> from <node> out of this scope, which doesn't define
+        it: in the enclosing scopes, then in builtins
+        """
         if self.parent: # i.e. not Module
-            # nested scope: if parent scope is a function, that's fine
-            # else jump to the module
-            pscope = self.parent.scope()
-            if not pscope.is_function:
-                pscope = pscope.root()
+            free_names = self._free_names
+            if free_names is None or free_names[0] != MANAGER.cache_epoch:
+                free_names = self._free_names = (MANAGER.cache_epoch, {})
+            try:
+                pscope = free_names[1][name]
+            except KeyError:
+                pscope = free_names[1][name] = self._binding_scope(name)
             return pscope.scope_lookup(node, name)
-        return builtin_lookup(name) # Module
+        # Module: lookup in builtins
+        table = _BUILTINS_TABLE
+        if table is None or table[0] != MANAGER.cache_epoch:
+            table = _builtins_table()
+        return table[1], table[2].get(name, ())
+
+    def _binding_scope(self, name):
+        """return the first enclosing scope where <name> has to be looked up
+        from this scope: the first enclosing function defining it or else the
+        module (nested scope: if parent scope is a function, that's fine else
+        jump to the module)
+        """
+        scope = self
+        while True:
+            pscope = scope.parent.scope()
+            if not pscope.is_function:
+                return pscope.root()
+            if pscope.locals.get(name):
+                return pscope
+            scope = pscope
 
 
 
@@ -206,6 +461,14 @@ class LocalsDictNodeNG(LookupMixIn, NodeNG):
 
 # Module  #####################################################################
 
+def _literal_names(node):
+    """return values of a Tuple/List of constants, else None"""
+    try:
+        return [const.value for const in node.elts]
+    except AttributeError:
+        return None
+
+
 class Module(LocalsDictNodeNG):
     _astroid_fields = ('body',)
 
@@ -258,10 +521,7 @@ class Module(LocalsDictNodeNG):
 
     def scope_lookup(self, node, name, offset=0):
         if name in self.scope_attrs and not name in self.locals:
-            try:
-                return self, self.getattr(name)
-            except NotFoundError:
-                return self, ()
+            return self, self.lookup_attr(name, ())
         return self._scope_lookup(node, name, offset)
 
     def pytype(self):
@@ -271,24 +531,84 @@ class Module(LocalsDictNodeNG):
         return 'Module'
 
     def getattr(self, name, context=None, ignore_locals=False):
+        values = self._getattr(name, context, ignore_locals)
+        if not values:
+            raise NotFoundError(name)
+        return values
+
+    def lookup_attr(self, name, default=None, context=None,
+                    ignore_locals=False):
+        """return the same nodes as getattr, or <default> if the attribute
+        isn't found
+        """
+        return self._getattr(name, context, ignore_locals) or default
+
+    def has_attr(self, name, context=None):
+        """return True if getattr would find the attribute"""
+        return bool(self._getattr(name, context))
+
+    def _getattr(self, name, context=None, ignore_locals=False):
         if name in self.special_attributes:
             if name == '__file__':
-                return [cf(self.file)] + self.locals.get(name, [])
-            if name == '__path__' and self.package:
-                return [List()] + self.locals.get(name, [])
-            return std_special_attributes(self, name)
-        if not ignore_locals and name in self.locals:
-            return self.locals[name]
-        if self.package:
+                values = [cf(self.file)] + self.locals.get(name, [])
+            elif name == '__path__' and self.package:
+                values = [List()] + self.locals.get(name, [])
+            elif name != '__path__':
+                values = std_special_attributes(self, name)
+            else:
+                return []
+        elif not ignore_locals and name in self.locals:
+            values = self.locals[name]
+        elif self.package:
+            if not self._may_be_submodule(name):
+                return []
             try:
-                return [self.import_module(name, relative_only=True)]
+                values = [self.import_module(name, relative_only=True)]
             except AstroidBuildingException:
-                raise NotFoundError(name)
+                return []
             except Exception:# XXX pylint tests never pass here; do we need it?
                 import traceback
                 traceback.print_exc()
-        raise NotFoundError(name)
-    getattr = remove_nodes(getattr, DelName)
+                return []
+        else:
+            return []
+        return [node for node in values if not isinstance(node, DelName)]
+
+    # names which may be submodules of this package, None if unknown, False
+    # until computed, see _may_be_submodule
+    _submodules = False
+
+    def _may_be_submodule(self, name):
+        """return False if <name> is known not to be a submodule or
+        subpackage of this package, without touching the file system once its
+        directory has been listed
+        """
+        submodules = self._submodules
+        if submodules is False:
+            submodules = self._submodules = self._list_submodules()
+        if submodules is None or name in submodules:
+            return True
+        # modules may also be built from elsewhere than the package directory
+        modname = self.relative_to_absolute_name(name, 0)
+        return modname in MANAGER.astroid_cache
+
+    def _list_submodules(self):
+        """return names of this package's directory entries, or None if its
+        submodules may be found elsewhere"""
+        if self.file is None or not self.pure_python:
+            return None
+        # namespace packages (pkgutil or setuptools) extend their path
+        for node in self.nodes_of_class((Name, Getattr)):
+            if isinstance(node, Name):
+                if node.name in ('__path__', 'declare_namespace'):
+                    return None
+            elif node.attrname == 'declare_namespace':
+                return None
+        directory = self.file
+        # packages imported from zip archives are given their directory
+        if basename(directory).startswith('__init__.'):
+            directory = dirname(directory)
+        return MANAGER.package_entries(directory)
 
     def igetattr(self, name, context=None):
         """inferred getattr"""
@@ -296,10 +616,10 @@ class Module(LocalsDictNodeNG):
         # instance
         context = copy_context(context)
         context.lookupname = name
-        try:
-            return _infer_stmts(self.getattr(name, context), context, frame=self)
-        except NotFoundError:
+        values = self._getattr(name, context)
+        if not values:
             raise InferenceError(name)
+        return _infer_stmts(values, context, frame=self)
 
     def fully_defined(self):
         """return True if this module has been built from a .py file
@@ -369,6 +689,43 @@ class Module(LocalsDictNodeNG):
         return modname
 
 
+    def infer_all(self, node_classes=None, shared=False):
+        """infer every node of the given classes (Name, Getattr and CallFunc
+        by default) in this module, and return a dictionary mapping each of
+        them to the list of its inferred values (empty if inference failed).
+
+        Nodes are inferred scope by scope, the module's scope first, and
+        children before their parent, so that inferences reuse the cached
+        results of the inference of nodes they depend on. The inference cache
+        is enabled during the call.
+
+        When `shared` is true, those results are also reused by inferences
+        started with a non empty path (see `InferenceCache.shared`), which is
+        faster but may give more values than `node.infered()` would, since
+        values cut by a cycle in that path aren't cut anymore.
+        """
+        if node_classes is None:
+            node_classes = (Name, Getattr, CallFunc)
+        results = {}
+        previous = INFERENCE_CACHE.enabled, INFERENCE_CACHE.shared
+        INFERENCE_CACHE.enabled = True
+        INFERENCE_CACHE.shared = shared
+        try:
+            scopes = deque([self])
+            while scopes:
+                for node in _scope_nodes(scopes.popleft(), scopes):
+                    if isinstance(node, node_classes):
+                        try:
+                            results[node] = node.infered()
+                        except InferenceError:
+                            results[node] = []
+        finally:
+            INFERENCE_CACHE.enabled, INFERENCE_CACHE.shared = previous
+        return results
+
+    # (cache epoch, names), see wildcard_import_names
+    _wildcard_names = None
+
     def wildcard_import_names(self):
         """return the list of imported names when this module is 'wildcard
         imported'
@@ -376,39 +733,90 @@ class Module(LocalsDictNodeNG):
         It doesn't include the '__builtins__' name which is added by the
         current CPython implementation of wildcard imports.
         """
-        # take advantage of a living module if it exists
+        cache = self._wildcard_names
+        if cache is None or cache[0] != MANAGER.cache_epoch:
+            names = self._compute_wildcard_names()
+            cache = self._wildcard_names = (MANAGER.cache_epoch, names)
+        return list(cache[1])
+
+    def _compute_wildcard_names(self):
+        """return names given by a literal '__all__', else by the living
+        module if it's already imported, else by the tree as far as possible
+        """
+        names, complete = self._explicit_all()
+        if not complete:
+            # take advantage of an already imported living module, never
+            # import it here
+            living = sys.modules.get(self.name)
+            if living is not None:
+                try:
+                    return list(living.__all__)
+                except AttributeError:
+                    return [name for name in living.__dict__.keys()
+                            if not name.startswith('_')]
+        if names is None:
+            names = [name for name, stmts in self.locals.iteritems()
+                     if not name.startswith('_')
+                     and not self._deleted(stmts[-1])]
+        return names
+
+    def _deleted(self, node):
+        """return true if <node> is a module level `del` statement"""
+        return isinstance(node, DelName) and node.statement().parent is self
+
+    def _explicit_all(self):
+        """return a (names, complete) tuple: names listed in this module's
+        '__all__' (None if it isn't defined or can't be statically analysed)
+        and whether they are known to be exhaustive.
+
+        The first assignment gives the list, later `__all__ += [...]` extend
+        it. '__all__' is not complete if it is missing or changed otherwise,
+        e.g. by `__all__.extend(...)` or from non literal values.
+        """
+        stmts = self.locals.get('__all__')
+        if not stmts:
+            return None, False
+        explicit = stmts[0]
+        # raw built modules hold the value itself
+        if isinstance(explicit, (List, Tuple)):
+            return _literal_names(explicit), True
         try:
-            living = sys.modules[self.name]
-        except KeyError:
-            pass
+            explicit = explicit.assigned_stmts().next()
+        except (InferenceError, AttributeError):
+            return None, False
+        names = _literal_names(explicit)
+        if names is None:
+            return None, False
+        complete = True
+        for node in stmts[1:]:
+            stmt = node.parent
+            if (isinstance(node, AssName) and isinstance(stmt, AugAssign)
+                and stmt.op == '+='):
+                extra = _literal_names(stmt.value)
+                if extra is not None:
+                    names += extra
+                    continue
+            complete = False
+        if complete:
+            # any other use of the name may change the list
+            for node in self.nodes_of_class(Name):
+                if node.name == '__all__':
+                    complete = False
+                    break
+        return names, complete
+
+
+def _scope_nodes(scope, scopes):
+    """generate nodes of the given scope, children before their parent,
+    adding nested scopes to <scopes> instead of generating their nodes
+    """
+    for child in scope.get_children():
+        if isinstance(child, LocalsDictNodeNG):
+            scopes.append(child)
         else:
-            try:
-                return living.__all__
-            except AttributeError:
-                return [name for name in living.__dict__.keys()
-                        if not name.startswith('_')]
-        # else lookup the astroid
-        #
-        # We separate the different steps of lookup in try/excepts
-        # to avoid catching too many Exceptions
-        # However, we can not analyse dynamically constructed __all__
-        try:
-            all = self['__all__']
-        except KeyError:
-            return [name for name in self.keys() if not name.startswith('_')]
-        try:
-            explicit = all.assigned_stmts().next()
-        except InferenceError:
-            return [name for name in self.keys() if not name.startswith('_')]
-        except AttributeError:
-            # not an assignment node
-            # XXX infer?
-            return [name for name in self.keys() if not name.startswith('_')]
-        try:
-            # should be a Tuple/List of constant string / 1 string not allowed
-            return [const.value for const in explicit.elts]
-        except AttributeError:
-            return [name for name in self.keys() if not name.startswith('_')]
+            for node in _scope_nodes(child, scopes):
+                yield node
+        yield child
 
 
 class ComprehensionScope(LocalsDictNodeNG):
@@ -470,6 +878,10 @@ class Lambda(LocalsDictNodeNG, FilterStmtsMixin):
 
     # function's type, 'function' | 'method' | 'staticmethod' | 'classmethod'
     type = 'function'
+    # Return and Yield nodes of the function's own scope, set by the rebuilder
+    # (searched in the tree when None)
+    _returns = None
+    _yields = None
 
     def __init__(self):
         self.locals = {}
@@ -558,11 +970,29 @@ class Function(Statement, Lambda):
         """this method doesn't look in the instance_attrs dictionary since it's
         done by an Instance proxy at inference time.
         """
+        values = self._getattr(name, context)
+        if not values:
+            raise NotFoundError(name)
+        return values
+
+    def lookup_attr(self, name, default=None, context=None):
+        """return the same nodes as getattr, or <default> if the attribute
+        isn't found
+        """
+        return self._getattr(name, context) or default
+
+    def has_attr(self, name, context=None):
+        """return True if getattr would find the attribute"""
+        return bool(self._getattr(name, context))
+
+    def _getattr(self, name, context=None):
         if name == '__module__':
             return [cf(self.root().qname())]
         if name in self.instance_attrs:
             return self.instance_attrs[name]
-        return std_special_attributes(self, name, False)
+        if name in self.special_attributes:
+            return std_special_attributes(self, name, False)
+        return []
 
     def is_method(self):
         """return true if the function node should be considered as a method"""
@@ -618,18 +1048,27 @@ class Function(Statement, Lambda):
 
     def is_generator(self):
         """return true if this is a generator function"""
-        # XXX should be flagged, not computed
-        try:
-            return self.nodes_of_class(Yield, skip_klass=(Function, Lambda)).next()
-        except StopIteration:
-            return False
+        if self._yields is None:
+            yields = self.nodes_of_class(Yield, skip_klass=(Function, Lambda))
+            try:
+                return yields.next()
+            except StopIteration:
+                return False
+        if self._yields:
+            return self._yields[0]
+        return False
 
     def infer_call_result(self, caller, context=None):
         """infer what a function is returning when called"""
         if self.is_generator():
-            yield Generator()
-            return
-        returns = self.nodes_of_class(Return, skip_klass=Function)
+            return iter((GENERATOR,))
+        return CALL_RESULT_CACHE.infer_call_result(self, self._infer_returns,
+                                                   context)
+
+    def _infer_returns(self, context):
+        returns = self._returns
+        if returns is None:
+            returns = self.nodes_of_class(Return, skip_klass=Function)
         for returnnode in returns:
             if returnnode.value is None:
                 yield Const(None)
@@ -641,6 +1080,204 @@ class Function(Statement, Lambda):
                     yield YES
 
 
+class CallResultCache(object):
+    """cache of values returned by function calls, with hit / miss counters.
+
+    Results are stored for the called function along with an abstract
+    signature of the call, made of the bound node and of the values of the
+    arguments used to infer them. `precision` tells how values are abstracted:
+
+    * 'value': constants by value, instances by class, other nodes by identity,
+    * 'class': constants by type, instances by class, other nodes by class,
+    * None: results aren't cached.
+
+    With 'class' precision, cached results can't depend on argument values:
+    constants are stored as instances of their type, and results of a call
+    returning other nodes than instances and methods aren't stored.
+
+    Arguments of a call are inferred once, when first needed to compare it to
+    a cached call or to infer its results. At most `max_size` results are
+    kept, the oldest being dropped first. They are dropped as well when the
+    manager invalidates its caches. Results of calls whose inference has been
+    stopped by a cycle or a limit aren't cached.
+    """
+
+    def __init__(self, precision='value', max_size=4096):
+        self.precision = precision
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._epoch = None
+        # function -> [(bound node, signature, results)]
+        self._results = {}
+        # (function, entry) from the oldest to the newest
+        self._entries = deque()
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self._results.clear()
+        self._entries.clear()
+
+    def infer_call_result(self, func, infer, context):
+        """return an iterator on values returned by <func> when called using
+        <context>, calling <infer> with the context if they aren't cached
+        """
+        if (self.precision is None or context is None
+            or context.callcontext is None):
+            return infer(context)
+        if self._epoch != MANAGER.cache_epoch:
+            self.clear()
+            self._epoch = MANAGER.cache_epoch
+        callcontext = _InferredCallContext(self, func, context)
+        bound = self._abstract(context.boundnode)
+        for entry in self._results.get(func, ()):
+            if entry[0] == bound and callcontext.matches(entry[1]):
+                self.hits += 1
+                return iter(entry[2])
+        self.misses += 1
+        context = context.clone()
+        context.callcontext = callcontext
+        return self._cache_generator(infer(context), func, bound, callcontext)
+
+    def _cache_generator(self, iterator, func, bound, callcontext):
+        cycles = InferenceContext.cycles
+        exceeded = INFERENCE_LIMITS.exceeded
+        results = []
+        for infered in iterator:
+            results.append(infered)
+            yield infered
+        if (InferenceContext.cycles != cycles
+            or INFERENCE_LIMITS.exceeded != exceeded):
+            return
+        if self.precision == 'class':
+            results = _generalize_results(results)
+            if results is None:
+                return
+        if len(self._entries) >= self.max_size:
+            self._drop_oldest()
+        entry = (bound, callcontext.signature(), results)
+        self._results.setdefault(func, []).append(entry)
+        self._entries.append((func, entry))
+
+    def _drop_oldest(self):
+        func, entry = self._entries.popleft()
+        entries = self._results[func]
+        for index, other in enumerate(entries):
+            if other is entry:
+                del entries[index]
+                break
+        if not entries:
+            del self._results[func]
+
+    def abstract_argument(self, (values, error)):
+        """return the abstraction of values inferred for an argument"""
+        if error is not None:
+            return None
+        return frozenset(self._abstract(value) for value in values)
+
+    def _abstract(self, value):
+        if value is None or value is YES:
+            return value
+        if isinstance(value, Const):
+            if self.precision == 'class':
+                return (Const, value.value.__class__)
+            try:
+                hash(value.value)
+            except TypeError:
+                return value
+            return (Const, value.value.__class__, value.value)
+        # lists, tuples... are instances as well, but with their own values
+        if value.__class__ is Instance:
+            return (Instance, value._proxied)
+        if isinstance(value, BoundMethod):
+            return (BoundMethod, value._proxied, self._abstract(value.bound))
+        if isinstance(value, UnboundMethod):
+            return (UnboundMethod, value._proxied)
+        if self.precision == 'class':
+            return value.__class__
+        return value
+
+CALL_RESULT_CACHE = CallResultCache()
+
+
+def _generalize_results(results):
+    """return call results which don't depend on the value of arguments
+    abstracted by class, or None if they may"""
+    generalized = []
+    for value in results:
+        if isinstance(value, Const):
+            if value.value is not None:
+                value = value._proxied.instanciate_class()
+                if [other for other in generalized if other is value]:
+                    continue
+        elif not (value is YES or value.__class__ is Instance
+                  or isinstance(value, (BoundMethod, UnboundMethod))):
+            return None
+        generalized.append(value)
+    return generalized
+
+
+class _InferredCallContext(object):
+    """call context inferring arguments of a function once, and recording
+    which of them have been used
+    """
+
+    def __init__(self, cache, func, context):
+        self.cache = cache
+        self.func = func
+        self.callcontext = context.callcontext
+        # arguments are inferred as by the function's Arguments node
+        self.context = context.clone()
+        self.context.callcontext = None
+        # name -> (values, error)
+        self.arguments = {}
+        self.used = []
+
+    def infer_argument(self, funcnode, name, context):
+        if funcnode is self.func:
+            return _replay(*self._argument(name))
+        return self.callcontext.infer_argument(funcnode, name, context)
+
+    def matches(self, signature):
+        """return True if arguments of this call match <signature>"""
+        for name, abstract in signature:
+            if self.cache.abstract_argument(self._argument(name)) != abstract:
+                return False
+        return True
+
+    def signature(self):
+        """return the signature of arguments used so far"""
+        return tuple((name, self.cache.abstract_argument(self.arguments[name]))
+                     for name in self.used)
+
+    def _argument(self, name):
+        try:
+            return self.arguments[name]
+        except KeyError:
+            pass
+        values = []
+        try:
+            for value in self.callcontext.infer_argument(self.func, name,
+                                                         self.context.clone()):
+                values.append(value)
+        except InferenceError, error:
+            argument = (values, error)
+        else:
+            argument = (values, None)
+        self.arguments[name] = argument
+        self.used.append(name)
+        return argument
+
+
+def _replay(values, error):
+    for value in values:
+        yield value
+    if error is not None:
+        raise error
+
+
 def _rec_get_names(args, names=None):
     """return a list of all argument names"""
     if names is None:
@@ -685,6 +1322,105 @@ def _class_type(klass, ancestors=None):
         klass._type = 'class'
     return klass._type
 
+def _c3_merge(sequences):
+    """merge <sequences>, lists of classes, according to the C3
+    linearization, or return None if it can't be done
+    """
+    result = []
+    sequences = [list(sequence) for sequence in sequences if sequence]
+    while sequences:
+        for sequence in sequences:
+            head = sequence[0]
+            for other in sequences:
+                if head in other[1:]:
+                    break
+            else:
+                break
+        else:
+            # inconsistent hierarchy
+            return None
+        result.append(head)
+        for sequence in sequences:
+            if sequence[0] is head:
+                del sequence[0]
+        sequences = [sequence for sequence in sequences if sequence]
+    return result
+
+class _ClassNamespace(object):
+    """attributes of a class and of its ancestors, looked up along its method
+    resolution order and memorized by name
+    """
+    __slots__ = ('epoch', 'mro', 'attrs', 'owners', 'instance_attrs',
+                 'merged_attrs', 'methods', 'dynamic_getattr', 'descriptor')
+
+    def __init__(self, klass):
+        self.epoch = MANAGER.cache_epoch
+        self.mro = klass.mro()
+        # name -> nodes defining it in locals of the mro's classes
+        self.attrs = {}
+        # name -> first class of the mro defining it in its locals
+        self.owners = {}
+        # name -> nodes defining it in instance attributes of the mro's classes
+        self.instance_attrs = {}
+        # name -> instance attributes followed by locals, see Instance.getattr
+        self.merged_attrs = {}
+        # methods defined by the mro's classes, see Class.methods
+        self.methods = None
+        # flags computed on demand, see Class.has_dynamic_getattr and
+        # Class.is_descriptor
+        self.dynamic_getattr = None
+        self.descriptor = None
+
+    def attr(self, name):
+        """return nodes defining <name> in the class and its ancestors'
+        locals (the returned list must not be modified)
+        """
+        try:
+            return self.attrs[name]
+        except KeyError:
+            values = self.attrs[name] = []
+            for klass in self.mro:
+                values += klass.locals.get(name, ())
+            return values
+
+    def owner(self, name):
+        """return the first class defining <name> in its locals, or None"""
+        try:
+            return self.owners[name]
+        except KeyError:
+            for klass in self.mro:
+                if name in klass.locals:
+                    break
+            else:
+                klass = None
+            self.owners[name] = klass
+            return klass
+
+    def instance_attr(self, name):
+        """return nodes defining <name> in the class and its ancestors'
+        instance attributes (the returned list must not be modified)
+        """
+        try:
+            return self.instance_attrs[name]
+        except KeyError:
+            values = []
+            for klass in self.mro:
+                values += klass.instance_attrs.get(name, ())
+            values = self.instance_attrs[name] = [
+                node for node in values if not isinstance(node, DelAttr)]
+            return values
+
+    def merged_attr(self, name):
+        """return nodes defining <name> in instance attributes then in locals
+        of the class and its ancestors (the returned list must not be modified)
+        """
+        try:
+            return self.merged_attrs[name]
+        except KeyError:
+            values = self.merged_attrs[name] = (self.instance_attr(name)
+                                                + self.attr(name))
+            return values
+
 def _iface_hdlr(iface_node):
     """a handler function used by interfaces to handle suspicious
     interface nodes
@@ -706,6 +1442,8 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
     blockstart_tolineno = None
 
     _type = None
+    # Instance returned by instanciate_class
+    _instance = None
     type = property(_class_type,
                     doc="class'type, possible values are 'class' | "
                     "'metaclass' | 'interface' | 'exception'")
@@ -763,7 +1501,7 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
 
     def infer_call_result(self, caller, context=None):
         """infer what a class is returning when called"""
-        yield Instance(self)
+        yield self.instanciate_class()
 
     def scope_lookup(self, node, name, offset=0):
         if node in self.bases:
@@ -782,19 +1520,35 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
     basenames = property(basenames)
 
     def ancestors(self, recurs=True, context=None):
-        """return an iterator on the node base classes in a prefixed
-        depth first order
+        """return an iterator on the node base classes in method resolution
+        order (see `mro`)
 
         :param recurs:
           boolean indicating if it should recurse or return direct
           ancestors only
         """
-        # FIXME: should be possible to choose the resolution order
+        if recurs:
+            return iter(self.mro()[1:])
+        return iter(self._base_classes())
+
+    # (cache epoch, inferred base classes), see _base_classes
+    _bases_cache = None
+    # (cache epoch, method resolution order), see mro
+    _mro = None
+
+    def _base_classes(self):
+        """return the classes inferred from the bases of the class, computed
+        once until the manager's caches are invalidated
+        """
+        cache = self._bases_cache
+        if cache is not None and cache[0] == MANAGER.cache_epoch:
+            return cache[1]
         # XXX inference make infinite loops possible here (see BaseTransformer
-        # manipulation in the builder module for instance)
-        yielded = set([self])
-        if context is None:
-            context = InferenceContext()
+        # manipulation in the builder module for instance): the class has no
+        # base while they're inferred
+        self._bases_cache = (MANAGER.cache_epoch, [])
+        bases = []
+        context = InferenceContext()
         for stmt in self.bases:
             with context.restore_path():
                 try:
@@ -802,19 +1556,60 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
                         if not isinstance(baseobj, Class):
                             # duh ?
                             continue
-                        if baseobj in yielded:
+                        if baseobj is self or baseobj in bases:
                             continue # cf xxx above
-                        yielded.add(baseobj)
-                        yield baseobj
-                        if recurs:
-                            for grandpa in baseobj.ancestors(True, context):
-                                if grandpa in yielded:
-                                    continue # cf xxx above
-                                yielded.add(grandpa)
-                                yield grandpa
+                        bases.append(baseobj)
                 except InferenceError:
                     # XXX log error ?
                     continue
+        self._bases_cache = (MANAGER.cache_epoch, bases)
+        return bases
+
+    def mro(self):
+        """return the method resolution order of the class, starting with the
+        class itself.
+
+        This is the C3 linearization of the class hierarchy for new style
+        classes, and a depth first, left to right order for old style classes
+        or when the hierarchy can't be linearized (ancestor loop, inconsistent
+        bases). It is computed once until the manager's caches are invalidated.
+        """
+        cache = self._mro
+        if cache is not None and cache[0] == MANAGER.cache_epoch:
+            # ancestor loop: the class has no ancestor while computing its mro
+            return cache[1] or [self]
+        self._mro = (MANAGER.cache_epoch, None)
+        bases = self._base_classes()
+        sequences = [base.mro() for base in bases]
+        mro = None
+        if self.newstyle and not [seq for seq in sequences if self in seq]:
+            mro = _c3_merge(sequences + [bases])
+        if mro is None:
+            mro = []
+            yielded = set([self])
+            for sequence in sequences:
+                for klass in sequence:
+                    if not klass in yielded:
+                        yielded.add(klass)
+                        mro.append(klass)
+        mro.insert(0, self)
+        self._mro = (MANAGER.cache_epoch, mro)
+        return mro
+
+    # _ClassNamespace of the class, see _namespace
+    _namespace_cache = None
+
+    def _namespace(self):
+        """return the attributes namespace of the class, which is kept until
+        the manager's caches are invalidated
+        """
+        namespace = self._namespace_cache
+        if namespace is None or namespace.epoch != MANAGER.cache_epoch:
+            namespace = _ClassNamespace(self)
+            if self._mro[1] is not None:
+                # don't keep it while the mro is being computed
+                self._namespace_cache = namespace
+        return namespace
 
     def local_attr_ancestors(self, name, context=None):
         """return an iterator on astroid representation of parent classes
@@ -843,13 +1638,11 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
           if no attribute with this name has been find in this class or
           its parent classes
         """
-        try:
-            return self.locals[name]
-        except KeyError:
-            # get if from the first parent implementing it if any
-            for class_node in self.local_attr_ancestors(name, context):
-                return class_node.locals[name]
-        raise NotFoundError(name)
+        # get if from the first parent implementing it if any
+        owner = self._namespace().owner(name)
+        if owner is None:
+            raise NotFoundError(name)
+        return owner.locals[name]
     local_attr = remove_nodes(local_attr, DelAttr)
 
     def instance_attr(self, name, context=None):
@@ -860,18 +1653,36 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
           if no attribute with this name has been find in this class or
           its parent classes
         """
-        values = self.instance_attrs.get(name, [])
-        # get all values from parents
-        for class_node in self.instance_attr_ancestors(name, context):
-            values += class_node.instance_attrs[name]
+        values = self._instance_attr(name, context)
         if not values:
             raise NotFoundError(name)
-        return values
-    instance_attr = remove_nodes(instance_attr, DelAttr)
+        return list(values)
+
+    def _instance_attr(self, name, context=None):
+        """like instance_attr, but return an empty list if the attribute
+        isn't found (the returned list must not be modified)
+        """
+        return self._namespace().instance_attr(name)
+
+    def _instance_and_class_attr(self, name, context=None):
+        """return the concatenation of the lists returned by _instance_attr
+        and _getattr (the returned list must not be modified)
+        """
+        if name in self.special_attributes:
+            return (self._instance_attr(name, context)
+                    + self._getattr(name, context))
+        return self._namespace().merged_attr(name)
 
     def instanciate_class(self):
-        """return Instance of Class node, else return self"""
-        return Instance(self)
+        """return Instance of Class node, else return self.
+
+        The same Instance is always returned for a given class, so that
+        inferred instances may be compared by identity.
+        """
+        instance = self._instance
+        if instance is None:
+            instance = self._instance = Instance(self)
+        return instance
 
     def getattr(self, name, context=None):
         """this method doesn't look in the instance_attrs dictionary since it's
@@ -880,26 +1691,44 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
         It may return a YES object if the attribute has not been actually
         found but a __getattr__ or __getattribute__ method is defined
         """
-        values = self.locals.get(name, [])
-        if name in self.special_attributes:
-            if name == '__module__':
-                return [cf(self.root().qname())] + values
-            # FIXME: do we really need the actual list of ancestors?
-            # returning [Tuple()] + values don't break any test
-            # this is ticket http://www.logilab.org/ticket/52785
-            # XXX need proper meta class handling + MRO implementation
-            if name == '__bases__' or (name == '__mro__' and self.newstyle):
-                node = Tuple()
-                node.items = self.ancestors(recurs=True, context=context)
-                return [node] + values
-            return std_special_attributes(self, name)
-        # don't modify the list in self.locals!
-        values = list(values)
-        for classnode in self.ancestors(recurs=True, context=context):
-            values += classnode.locals.get(name, [])
+        values = self._getattr(name, context)
         if not values:
             raise NotFoundError(name)
-        return values
+        return list(values)
+
+    def lookup_attr(self, name, default=None, context=None):
+        """return the same nodes as getattr, or <default> if the attribute
+        isn't found
+        """
+        values = self._getattr(name, context)
+        if values:
+            return list(values)
+        return default
+
+    def has_attr(self, name, context=None):
+        """return True if getattr would find the attribute"""
+        return bool(self._getattr(name, context))
+
+    def _getattr(self, name, context=None):
+        """like getattr, but return an empty list if the attribute isn't
+        found (the returned list must not be modified)
+        """
+        if not name in self.special_attributes:
+            return self._namespace().attr(name)
+        values = self.locals.get(name, [])
+        if name == '__module__':
+            return [cf(self.root().qname())] + values
+        if name == '__bases__':
+            node = Tuple()
+            node.elts = list(self.ancestors(recurs=False, context=context))
+            return [node] + values
+        if name == '__mro__' and self.newstyle:
+            node = Tuple()
+            node.elts = list(self.mro())
+            return [node] + values
+        if name in ('__name__', '__doc__', '__dict__'):
+            return std_special_attributes(self, name)
+        return []
 
     def igetattr(self, name, context=None):
         """inferred getattr, need special treatment in class to handle
@@ -909,58 +1738,68 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
         # instance
         context = copy_context(context)
         context.lookupname = name
-        try:
-            for infered in _infer_stmts(self.getattr(name, context), context,
-                                        frame=self):
-                # yield YES object instead of descriptors when necessary
-                if not isinstance(infered, Const) and isinstance(infered, Instance):
-                    try:
-                        infered._proxied.getattr('__get__', context)
-                    except NotFoundError:
-                        yield infered
-                    else:
-                        yield YES
-                else:
-                    yield function_to_method(infered, self)
-        except NotFoundError:
+        values = self._getattr(name, context)
+        if not values:
             if not name.startswith('__') and self.has_dynamic_getattr(context):
                 # class handle some dynamic attributes, return a YES object
                 yield YES
+                return
+            raise InferenceError(name)
+        for infered in _infer_stmts(values, context, frame=self):
+            # yield YES object instead of descriptors when necessary
+            if not isinstance(infered, Const) and isinstance(infered, Instance):
+                if infered._proxied.is_descriptor():
+                    yield YES
+                else:
+                    yield infered
             else:
-                raise InferenceError(name)
+                yield function_to_method(infered, self)
 
     def has_dynamic_getattr(self, context=None):
         """return True if the class has a custom __getattr__ or
         __getattribute__ method
         """
+        namespace = self._namespace()
+        if namespace.dynamic_getattr is None:
+            namespace.dynamic_getattr = self._has_dynamic_getattr(namespace)
+        return namespace.dynamic_getattr
+
+    def _has_dynamic_getattr(self, namespace):
         # need to explicitly handle optparse.Values (setattr is not detected)
         if self.name == 'Values' and self.root().name == 'optparse':
             return True
-        try:
-            self.getattr('__getattr__', context)
+        if namespace.attr('__getattr__'):
             return True
-        except NotFoundError:
-            #if self.newstyle: XXX cause an infinite recursion error
-            try:
-                getattribute = self.getattr('__getattribute__', context)[0]
-                if getattribute.root().name != BUILTINS:
-                    # class has a custom __getattribute__ defined
-                    return True
-            except NotFoundError:
-                pass
-        return False
+        #if self.newstyle: XXX cause an infinite recursion error
+        getattribute = namespace.attr('__getattribute__')
+        # class has a custom __getattribute__ defined
+        return bool(getattribute) and getattribute[0].root().name != BUILTINS
+
+    def is_descriptor(self):
+        """return True if instances of the class are descriptors, i.e. if it
+        has a __get__ method
+        """
+        namespace = self._namespace()
+        if namespace.descriptor is None:
+            namespace.descriptor = bool(namespace.attr('__get__'))
+        return namespace.descriptor
 
     def methods(self):
         """return an iterator on all methods defined in the class and
         its ancestors
         """
-        done = {}
-        for astroid in chain(iter((self,)), self.ancestors()):
-            for meth in astroid.mymethods():
-                if meth.name in done:
-                    continue
-                done[meth.name] = None
-                yield meth
+        namespace = self._namespace()
+        if namespace.methods is None:
+            methods = []
+            done = {}
+            for astroid in namespace.mro:
+                for meth in astroid.mymethods():
+                    if meth.name in done:
+                        continue
+                    done[meth.name] = None
+                    methods.append(meth)
+            namespace.methods = methods
+        return iter(namespace.methods)
 
     def mymethods(self):
         """return an iterator on all methods defined in the class"""
@@ -973,10 +1812,10 @@ class Class(Statement, LocalsDictNodeNG, FilterStmtsMixin):
         class node
         """
         # FIXME: what if __implements__ = (MyIFace, MyParent.__implements__)...
-        try:
-            implements = Instance(self).getattr('__implements__')[0]
-        except NotFoundError:
+        implements = self.instanciate_class().lookup_attr('__implements__')
+        if implements is None:
             return
+        implements = implements[0]
         if not herited and not implements.frame() is self:
             return
         found = set()
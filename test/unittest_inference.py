@@ -23,10 +23,11 @@ from StringIO import StringIO
 
 from logilab.common.testlib import TestCase, unittest_main, require_version
 
-from astroid import InferenceError, builder, nodes
+from astroid import InferenceError, MANAGER, builder, nodes
 from astroid.inference import infer_end as inference_infer_end
 from astroid.bases import YES, Instance, BoundMethod, UnboundMethod,\
-                                path_wrapper, BUILTINS
+                                path_wrapper, BUILTINS, INFERENCE_CACHE, INFERENCE_LIMITS, \
+                                InferenceContext
 
 def get_name_node(start_from, name, index=0):
     return [n for n in start_from.nodes_of_class(nodes.Name) if n.name == name][index]
@@ -47,6 +48,31 @@ class InferenceUtilsTC(TestCase):
                               infer_default(1).next)
         self.assertEqual(infer_end(1).next(), 1)
 
+    def test_context_path(self):
+        node1, node2 = nodes.Name(), nodes.Name()
+        context = InferenceContext()
+        context.push(node1)
+        clone = context.clone()
+        clone.push(node2)
+        # pushes on a clone don't leak into the context it comes from
+        context.push(node2)
+        self.assertRaises(StopIteration, clone.push, node1)
+        self.assertRaises(StopIteration, clone.push, node2)
+        context.lookupname = 'a'
+        with context.restore_path():
+            context.push(node1)
+            self.assertRaises(StopIteration, context.push, node1)
+        context.push(node1)
+        # cycles are found once the path mask is saturated as well
+        names = [nodes.Name() for _ in range(200)]
+        context = InferenceContext()
+        for node in names:
+            context.push(node)
+        for node in names:
+            self.assertTrue(context.path.contains(node, None))
+        self.assertFalse(context.path.contains(node1, None))
+        self.assertFalse(context.path.contains(names[0], 'a'))
+
 if sys.version_info < (3, 0):
     EXC_MODULE = 'exceptions'
 else:
@@ -859,6 +885,86 @@ print (make_code)
         self.assertEqual(len(infered), 1)
         self.assertEqual(infered[0], YES)
 
+    def test_binary_op_size_guard(self):
+        code = '''
+a = 'x' * 10 ** 9
+b = 10 ** 9 * u'x'
+c = 2 ** 10 ** 8
+d = 1 << 10 ** 9
+e = (1,) * 10 ** 9
+f = 10 ** 9 * [None]
+g = 'x'
+g *= 10 ** 9
+h = 7 ** 10 ** 10 ** 10
+i = g
+        '''
+        astroid = builder.string_build(code, __name__, __file__)
+        for name in 'abcdefhi':
+            self.assertEqual(astroid[name].infered(), [YES], name)
+        # small values are still computed
+        code = 'a = "x" * 3; b = 3 * (1,); c = 2 ** 64; d = -2 ** 0.5; e = 1 << 3'
+        astroid = builder.string_build(code, __name__, __file__)
+        self._test_const_infered(astroid['a'], 'xxx')
+        self.assertEqual(len(astroid['b'].infered()[0].elts), 3)
+        self._test_const_infered(astroid['c'], 2 ** 64)
+        self._test_const_infered(astroid['d'], -2 ** 0.5)
+        self._test_const_infered(astroid['e'], 8)
+        # sizes of integers are estimated without int.bit_length (python 2.7)
+        from astroid.protocols import binary_op_size
+        self.assertEqual(binary_op_size('<<', 2 ** 64, 16), 11)
+        self.assertEqual(binary_op_size('**=', -256, 3), 6)
+
+    def test_binary_op_repeated_sequence(self):
+        code = '''
+a = [0, 1] * 1000000
+b = (None,) * 3 * 2
+c = not [1] * 0
+for x, y in [(1, 2)] * 1000:
+    pass
+d = a[-1]
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        a = astroid['a'].infered()[0]
+        self.assertIsInstance(a, nodes.List)
+        self.assertEqual(a.count, 1000000)
+        self.assertEqual([elt.value for elt in a.base], [0, 1])
+        self.assertEqual(a.getitem(3).value, 1)
+        self.assertEqual(a.getitem(-2).value, 0)
+        self.assertRaises(IndexError, a.getitem, 2000000)
+        self.assertEqual(len(a.getitem(slice(0, 5))), 5)
+        b = astroid['b'].infered()[0]
+        self.assertIsInstance(b, nodes.Tuple)
+        self.assertEqual(b.count, 6)
+        self.assertEqual(len(b.expand()), 6)
+        self.assertEqual(b.as_string(), '(None, None, None, None, None, None)')
+        self._test_const_infered(astroid['c'], True)
+        self._test_const_infered(astroid['d'], 1)
+        self._test_const_infered(astroid['x'], 1)
+        self._test_const_infered(astroid['y'], 2)
+
+    def test_loop_on_repeated_sequence(self):
+        code = '''
+for x in [0, 1] * 4000000:
+    pass
+for y, z in [(1, 2)] * 4000000:
+    pass
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        # the repeated part is only visited once
+        getitem = nodes.Tuple.getitem
+        visited = []
+        def count_getitem(self, index, context=None):
+            visited.append(index)
+            return getitem(self, index, context)
+        nodes.Tuple.getitem = count_getitem
+        try:
+            self.assertEqual([v.value for v in astroid['x'].infered()], [0, 1])
+            self.assertEqual([v.value for v in astroid['y'].infered()], [1])
+            self.assertEqual([v.value for v in astroid['z'].infered()], [2])
+        finally:
+            nodes.Tuple.getitem = getitem
+        self.assertEqual(visited, [0, 1])
+
 
     def test_binary_op_tuple_add(self):
         astroid = builder.string_build('a = (1,) + (2,)', __name__, __file__)
@@ -1174,6 +1280,102 @@ B = namedtuple('B', 'a b')
         self.assertIn('a', bclass.instance_attrs)
         self.assertIn('b', bclass.instance_attrs)
 
+    def test_inference_cache(self):
+        code = '''
+def func():
+    return 42
+value = func()
+undefined
+        '''
+        astroid = builder.string_build(code, __name__, __file__)
+        value = astroid['value']
+        undefined = astroid.body[-1].value
+        INFERENCE_CACHE.reset_stats()
+        infered = value.infered()
+        self.assertEqual(INFERENCE_CACHE.hits, 0)
+        self.assertEqual(value.infered(), infered)
+        self.assertEqual(INFERENCE_CACHE.hits, 1)
+        # inference errors are cached as well
+        self.assertRaises(InferenceError, undefined.infered)
+        self.assertRaises(InferenceError, undefined.infered)
+        self.assertEqual(INFERENCE_CACHE.hits, 2)
+        # until the manager invalidates its caches
+        MANAGER.invalidate_caches()
+        self.assertEqual(value.infered()[0].value, 42)
+        self.assertEqual(INFERENCE_CACHE.hits, 2)
+        INFERENCE_CACHE.enabled = False
+        try:
+            self.assertEqual(value.infered()[0].value, 42)
+            self.assertEqual(INFERENCE_CACHE.hits, 2)
+        finally:
+            INFERENCE_CACHE.enabled = True
+
+    def test_inference_cache_builds(self):
+        code = '''
+def func():
+    return 42
+value = func()
+        '''
+        astroid = builder.string_build(code, 'cache_builds_a', __file__)
+        value = astroid['value']
+        value.infered()
+        INFERENCE_CACHE.reset_stats()
+        # building another module keeps results
+        builder.string_build('a = 1', 'cache_builds_b', __file__)
+        self.assertEqual(value.infered()[0].value, 42)
+        self.assertEqual(INFERENCE_CACHE.hits, 1)
+        # unless it updates other trees
+        code = '''
+import cache_builds_a
+cache_builds_a.other = 1
+        '''
+        builder.string_build(code, 'cache_builds_c', __file__)
+        self.assertIn('other', astroid.locals)
+        self.assertEqual(value.infered()[0].value, 42)
+        self.assertEqual(INFERENCE_CACHE.hits, 1)
+        del MANAGER.astroid_cache['cache_builds_a']
+        del MANAGER.astroid_cache['cache_builds_b']
+        del MANAGER.astroid_cache['cache_builds_c']
+
+    def test_inference_limits(self):
+        code = '''
+a = 1
+b = a
+c = b
+d = c
+if d:
+    e = 1
+elif d:
+    e = 2
+else:
+    e = 3
+f = e
+        '''
+        astroid = builder.string_build(code, __name__, __file__)
+        c = astroid.body[2].value
+        d = astroid.body[3].value
+        INFERENCE_LIMITS.reset_stats()
+        try:
+            INFERENCE_LIMITS.max_depth = 3
+            self.assertEqual(list(d.infer(InferenceContext())), [YES])
+            self.assertEqual(INFERENCE_LIMITS.depth_exceeded, 1)
+            INFERENCE_LIMITS.max_depth = None
+            INFERENCE_LIMITS.max_values = 2
+            infered = list(astroid.body[5].value.infer())
+            self.assertEqual([n.value for n in infered[:2]], [1, 2])
+            self.assertIs(infered[2], YES)
+            self.assertEqual(INFERENCE_LIMITS.values_exceeded, 1)
+            INFERENCE_LIMITS.max_values = None
+            # already expired
+            INFERENCE_LIMITS.timeout = -1
+            self.assertEqual(list(c.infer(InferenceContext())), [YES])
+            self.assertEqual(INFERENCE_LIMITS.timeout_exceeded, 1)
+        finally:
+            INFERENCE_LIMITS.__init__()
+        # results cut by a limit aren't cached
+        self.assertEqual([n.value for n in d.infer()], [1])
+        self.assertEqual([n.value for n in c.infer()], [1])
+
 
 if __name__ == '__main__':
     unittest_main()
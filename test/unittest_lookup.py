@@ -22,9 +22,10 @@ from os.path import join, abspath, dirname
 
 from logilab.common.testlib import TestCase, unittest_main, require_version
 
-from astroid import builder, nodes, scoped_nodes, \
+from astroid import builder, nodes, scoped_nodes, MANAGER, \
      InferenceError, NotFoundError, UnresolvableName
-from astroid.scoped_nodes import builtin_lookup, Function
+from astroid.node_classes import LOOKUP_CACHE
+from astroid.scoped_nodes import builtin_lookup, is_builtin_name, Function
 from astroid.bases import YES
 from unittest_inference import get_name_node
 
@@ -272,6 +273,11 @@ def initialize(linter):
         self.assertIsInstance(intstmts[0], nodes.Class)
         self.assertEqual(intstmts[0].name, 'int')
         self.assertIs(intstmts[0], nodes.const_factory(1)._proxied)
+        self.assertEqual(builtin_lookup('not_a_builtin')[1], ())
+        self.assertTrue(is_builtin_name('len'))
+        self.assertTrue(is_builtin_name('None'))
+        self.assertFalse(is_builtin_name('__dict__'))
+        self.assertFalse(is_builtin_name('not_a_builtin'))
 
 
     def test_decorator_arguments_lookup(self):
@@ -356,5 +362,129 @@ def run1():
         stmts = astroid['run1'].lookup('Frobbel')[1]
         self.assertEqual(len(stmts), 0)
 
+    def test_bindings_index(self):
+        code = '''
+x = 0
+x = 1
+if cond:
+    x = 2
+x = 3
+if cond:
+    x = 4
+else:
+    x = 5
+    x = 6
+print (x)
+for x in range(5):
+    print (x)
+print (x)
+x = 7
+print (x)
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        xnames = [n for n in astroid.nodes_of_class(nodes.Name) if n.name == 'x']
+        lines = lambda node: [stmt.lineno for stmt in node.lookup('x')[1]]
+        self.assertEqual(lines(xnames[0]), [6, 8, 10, 11])
+        self.assertEqual(lines(xnames[1]), [13])
+        self.assertEqual(lines(xnames[2]), [6, 8, 10, 11, 13])
+        self.assertEqual(lines(xnames[3]), [16])
+        # the index is rebuilt when locals are updated after the tree building
+        # (which requires lookup results to be invalidated)
+        astroid.locals['x'] = astroid.locals['x'][:2]
+        MANAGER.invalidate_caches()
+        self.assertEqual(lines(xnames[3]), [3])
+
+    def test_lookup_cache(self):
+        code = '''
+x = 1
+def f(x=x, y=lambda x: x):
+    pass
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        default, ret = [n for n in astroid.nodes_of_class(nodes.Name)]
+        self.assertIs(default.statement(), ret.statement())
+        LOOKUP_CACHE.reset_stats()
+        frame, stmts = default.lookup('x')
+        self.assertIs(frame, astroid)
+        self.assertEqual((LOOKUP_CACHE.hits, LOOKUP_CACHE.misses), (0, 1))
+        self.assertEqual(default.lookup('x'), (frame, stmts))
+        self.assertEqual((LOOKUP_CACHE.hits, LOOKUP_CACHE.misses), (1, 1))
+        # nodes of the same statement have their own results
+        self.assertIsInstance(ret.lookup('x')[0], nodes.Lambda)
+        self.assertEqual((LOOKUP_CACHE.hits, LOOKUP_CACHE.misses), (1, 2))
+        MANAGER.invalidate_caches()
+        self.assertEqual(default.lookup('x'), (frame, stmts))
+        self.assertEqual((LOOKUP_CACHE.hits, LOOKUP_CACHE.misses), (1, 3))
+
+    def test_index_definitions(self):
+        code = '''
+x = 0
+def f(c, x=x):
+    for i in c:
+        print x
+        if i:
+            del x
+            x = i
+        else:
+            x = -i
+        print x
+    print x, i, len
+    x = 1
+    print x
+class A:
+    x = x
+    def x(self):
+        pass
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        names = list(astroid.nodes_of_class((nodes.Name, nodes.AssName,
+                                             nodes.DelName)))
+        expected = [n.scope().scope_lookup(n, n.name) for n in names]
+        astroid.index_definitions()
+        function = astroid['f']
+        self.assertEqual(len(function._definitions[1]),
+                         len([n for n in names if n.scope() is function]))
+        enabled = LOOKUP_CACHE.enabled
+        LOOKUP_CACHE.enabled = False
+        try:
+            self.assertEqual([n.lookup(n.name) for n in names], expected)
+        finally:
+            LOOKUP_CACHE.enabled = enabled
+        # the index is dropped with other caches
+        use = [n for n in names if n.name == 'x' and n.lineno == 14][0]
+        self.assertEqual([s.lineno for s in use.lookup('x')[1]], [13])
+        function.locals['x'].pop()
+        MANAGER.invalidate_caches()
+        self.assertEqual([s.lineno for s in use.lookup('x')[1]], [8, 10])
+
+    def test_free_names(self):
+        code = '''
+x = y = 0
+def f(x):
+    def g():
+        class A:
+            def h(self):
+                return x, y
+        return lambda: (x, y, [x for _ in y])
+'''
+        astroid = builder.string_build(code, __name__, __file__)
+        f = astroid['f']
+        h = f['g']['A']['h']
+        lambda_ = [n for n in astroid.nodes_of_class(nodes.Lambda)
+                   if n.__class__ is nodes.Lambda][0]
+        # the enclosing class isn't a function: jump to the module
+        self.assertIs(h._binding_scope('x'), astroid)
+        self.assertIs(lambda_._binding_scope('x'), f)
+        self.assertIs(lambda_._binding_scope('y'), astroid)
+        for name in lambda_.nodes_of_class(nodes.Name):
+            if name.name in ('x', 'y'):
+                self.assertEqual(name.lookup(name.name)[0],
+                                 name.name == 'x' and f or astroid)
+        self.assertEqual(sorted(lambda_._free_names[1]), ['x', 'y'])
+        # free names are resolved again once caches are invalidated
+        del f.locals['x']
+        MANAGER.invalidate_caches()
+        self.assertIs(lambda_.body.elts[0].lookup('x')[0], astroid)
+
 if __name__ == '__main__':
     unittest_main()
@@ -24,6 +24,9 @@ from astroid.bases import  BUILTINS
 
 DATA = join(dirname(abspath(__file__)), 'data')
 
+def _module_functions(module):
+    return module.name, sorted(module.keys())
+
 class AstroidManagerTC(TestCase):
     def setUp(self):
         self.manager = AstroidManager()
@@ -66,6 +69,15 @@ class AstroidManagerTC(TestCase):
                 del sys.path_importer_cache[archive_path]
             sys.path = origpath
 
+    def test_package_entries(self):
+        self.assertEqual(self.manager.package_entries(join(DATA, 'appl')),
+                         set(['__init__', 'myConnection']))
+        archive = join(DATA, 'MyPyPa-0.1.0-py2.5.egg')
+        self.assertEqual(self.manager.package_entries(join(archive, 'mypypa')),
+                         set(['__init__']))
+        self.assertEqual(self.manager.package_entries(join(DATA, 'nothere')),
+                         None)
+
     def test_ast_from_module_name_egg(self):
         self._test_ast_from_zip('MyPyPa-0.1.0-py2.5.egg')
 
@@ -88,6 +100,33 @@ class AstroidManagerTC(TestCase):
                     'data.nonregr', 'data.notall']
         self.assertListEqual(sorted(k for k in obj.keys()), expected)
 
+    def test_map_modules(self):
+        modules = ['data.module', 'data.module2']
+        for processes in (1, 2):
+            results = dict(self.manager.map_modules(_module_functions, modules,
+                                                    processes))
+            self.assertEqual(sorted(results), sorted(modules))
+            self.assertEqual(results['data.module'],
+                             ('data.module',
+                              sorted(self.manager.ast_from_module_name('data.module').keys())))
+
+    def test_map_files(self):
+        files = [join(DATA, 'all.py'), join(DATA, 'notall.py')]
+        for processes in (1, 2):
+            results = dict(self.manager.map_files(_module_functions, files,
+                                                  processes))
+            self.assertEqual(results[files[0]][0], 'data.all')
+            self.assertEqual(results[files[1]][0], 'data.notall')
+        # module names aren't taken for paths, even if such a file exists
+        results = list(self.manager.map_modules(_module_functions, ['data'], 1))
+        self.assertEqual(results[0][1][0], 'data')
+
+    def test_project_map_modules(self):
+        obj = self.manager.project_from_files([DATA], _silent_no_wrap, 'data')
+        results = list(obj.map_modules(_module_functions, 2))
+        self.assertEqual(sorted(name for _, (name, _) in results),
+                         sorted(obj.keys()))
+
     def test_do_not_expose_main(self):
       obj = self.manager.ast_from_module_name('__main__')
       self.assertEqual(obj.name, '__main__')
@@ -0,0 +1,73 @@
+# copyright 2003-2013 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+try:
+    import json
+except ImportError: # python < 2.6
+    import simplejson as json
+from StringIO import StringIO
+
+from logilab.common.testlib import TestCase, unittest_main
+
+from astroid import builder, nodes
+from astroid.bases import INFERENCE_CACHE
+from astroid.exceptions import InferenceError
+from astroid.profiling import InferenceProfiler
+
+builder = builder.AstroidBuilder()
+
+class InferenceProfilerTC(TestCase):
+
+    def test_profile(self):
+        astroid = builder.string_build('''
+def func():
+    return 42
+value = func()
+undefined
+        ''', 'profiled', 'profiled.py')
+        infer_name = nodes.Name._infer
+        profiler = InferenceProfiler()
+        profiler.install()
+        try:
+            self.assertNotEqual(nodes.Name._infer, infer_name)
+            self.assertFalse(INFERENCE_CACHE.enabled)
+            # inferred twice, the second inference isn't replayed from cache
+            for _ in range(2):
+                self.assertEqual(astroid['value'].infered()[0].value, 42)
+            self.assertRaises(InferenceError, astroid.body[-1].value.infered)
+        finally:
+            profiler.uninstall()
+        self.assertEqual(nodes.Name._infer, infer_name)
+        self.assertTrue(INFERENCE_CACHE.enabled)
+        stats = json.load(StringIO(self._dump(profiler)))
+        self.assertEqual(stats['node_classes']['CallFunc']['calls'], 2)
+        self.assertEqual(stats['node_classes']['CallFunc']['values'], 2)
+        self.assertEqual(stats['locations']['profiled:5']['exceptions'], 1)
+        for key in ('AssName', 'CallFunc', 'Name'):
+            key_stats = stats['node_classes'][key]
+            self.assertTrue(0 <= key_stats['selftime'] <= key_stats['cumtime'])
+        chains = [slowest['chain'] for slowest in stats['slowest']]
+        self.assertIn(['AssName profiled:4', 'CallFunc profiled:4',
+                       'Name profiled:4'], [chain[:3] for chain in chains])
+
+    def _dump(self, profiler):
+        stream = StringIO()
+        profiler.dump(stream)
+        return stream.getvalue()
+
+if __name__ == '__main__':
+    unittest_main()
@@ -24,9 +24,10 @@ from os.path import join, abspath, dirname
 
 from logilab.common.testlib import TestCase, unittest_main
 
-from astroid import builder, nodes, scoped_nodes, \
+from astroid import builder, nodes, scoped_nodes, MANAGER, \
      InferenceError, NotFoundError, NoDefault
-from astroid.bases import BUILTINS, Instance, BoundMethod, UnboundMethod
+from astroid.bases import BUILTINS, YES, Instance, BoundMethod, UnboundMethod, \
+     INFERENCE_CACHE
 from astroid.test_utils import extract_node
 
 abuilder = builder.AstroidBuilder()
@@ -101,6 +102,42 @@ class ModuleNodeTC(TestCase):
         res = sorted(m.wildcard_import_names())
         self.assertEqual(res, ['Aaa', 'func', 'name', 'other'])
 
+    def test_wildcard_import_names_augmented(self):
+        data = '''
+__all__ = ['a']
+__all__ += ('_b', 'c')
+a = _b = c = d = 1
+        '''
+        # a literal __all__ is preferred to the living module
+        living_os = MANAGER.astroid_cache.get('os')
+        try:
+            astroid = abuilder.string_build(data, 'os', '')
+            names = astroid.wildcard_import_names()
+            self.assertEqual(names, ['a', '_b', 'c'])
+            names.append('d')
+            self.assertEqual(astroid.wildcard_import_names(),
+                             ['a', '_b', 'c'])
+        finally:
+            if living_os is None:
+                del MANAGER.astroid_cache['os']
+            else:
+                MANAGER.astroid_cache['os'] = living_os
+        data = '''
+__all__ = ['a']
+__all__.extend(['b'])
+        '''
+        try:
+            astroid = abuilder.string_build(data, 'wildcard_extended_all', '')
+            self.assertEqual(astroid.wildcard_import_names(), ['a'])
+        finally:
+            del MANAGER.astroid_cache['wildcard_extended_all']
+
+    def test_wildcard_import_dynamic_all(self):
+        # os builds its __all__ dynamically, the living module is used
+        astroid = abuilder.string_build('from os import *', __name__, '')
+        self.assertIn('getcwd', astroid.locals)
+        self.assertIn('listdir', astroid.locals)
+
     def test_module_getattr(self):
         data = '''
 appli = application
@@ -150,6 +187,21 @@ del appli
             del sys.path[1]
 
 
+    def test_package_submodules(self):
+        path = join(REGRTEST_DATA, 'package', '__init__.py')
+        astroid = abuilder.string_build('', 'package', path)
+        self.assertTrue(astroid._may_be_submodule('subpackage'))
+        self.assertTrue(astroid._may_be_submodule('hello'))
+        self.assertFalse(astroid._may_be_submodule('missing'))
+        self.assertEqual(astroid.lookup_attr('missing'), None)
+        # namespace packages may find submodules anywhere
+        data = '''
+import pkgutil
+__path__ = pkgutil.extend_path(__path__, __name__)
+        '''
+        astroid = abuilder.string_build(data, 'package', path)
+        self.assertTrue(astroid._may_be_submodule('missing'))
+
     def test_import_2(self):
         data = '''from . import subpackage as pouet'''
         astroid = abuilder.string_build(data, 'package', join(dirname(abspath(__file__)), 'regrtest_data', 'package', '__init__.py'))
@@ -163,6 +215,44 @@ del appli
         finally:
             del sys.path[1]
 
+    def test_infer_all(self):
+        data = '''
+def func(arg):
+    return arg
+value = func(1)
+value.real
+undefined
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        results = astroid.infer_all()
+        self.assertEqual(len(results), 6)
+        call = astroid.body[1].value
+        self.assertEqual([n.value for n in results[call]], [1])
+        self.assertEqual(len(results[astroid.body[2].value]), 1)
+        self.assertEqual(results[astroid.body[3].value], [])
+        # no call context there
+        self.assertEqual(results[astroid['func'].body[0].value], [YES])
+        results = astroid.infer_all(nodes.Function)
+        self.assertEqual(results, {astroid['func']: [astroid['func']]})
+
+    def test_infer_all_cache_state(self):
+        astroid = abuilder.string_build('value = 1', __name__, __file__)
+        name = astroid.body[0].targets[0]
+        state = []
+        def infered():
+            state.append((INFERENCE_CACHE.enabled, INFERENCE_CACHE.shared))
+            return []
+        name.infered = infered
+        INFERENCE_CACHE.enabled = False
+        try:
+            astroid.infer_all(nodes.AssName)
+            astroid.infer_all(nodes.AssName, shared=True)
+            self.assertEqual(state, [(True, False), (True, True)])
+            self.assertFalse(INFERENCE_CACHE.enabled)
+            self.assertFalse(INFERENCE_CACHE.shared)
+        finally:
+            INFERENCE_CACHE.enabled = True
+
 
 class FunctionNodeTC(TestCase):
 
@@ -364,6 +454,118 @@ test()
         self.assertIsInstance(one, nodes.Const)
         self.assertEqual(one.value, 1)
 
+    def test_returns_yields(self):
+        data = '''
+def gen(arg=lambda: (yield)):
+    def func():
+        return 1
+    lmbd = lambda: (yield)
+    yield 2
+    return
+
+def func():
+    class Nested:
+        def meth(self):
+            yield 3
+    if func:
+        return 4
+    return
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        gen, func = astroid['gen'], astroid['func']
+        self.assertEqual([n.lineno for n in gen._yields], [6])
+        self.assertEqual([n.lineno for n in gen._returns], [7])
+        self.assertEqual(gen.is_generator().lineno, 6)
+        self.assertEqual(func._yields, [])
+        self.assertEqual([n.lineno for n in func._returns], [14, 15])
+        self.assertFalse(func.is_generator())
+        self.assertEqual([n.value for n in func.infer_call_result(None)],
+                         [4, None])
+        self.assertTrue(astroid['func']['Nested']['meth'].is_generator())
+
+    def test_call_result_cache(self):
+        data = '''
+def ident(arg):
+    return arg
+
+ident(1)
+ident(1)
+ident(2)
+ident(3)
+ident(4)
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        calls = [stmt.value for stmt in astroid.body[1:]]
+        cache = scoped_nodes.CALL_RESULT_CACHE
+        cache.reset_stats()
+        self.assertEqual(calls[0].infered()[0].value, 1)
+        self.assertEqual(calls[1].infered()[0].value, 1)
+        self.assertEqual(calls[2].infered()[0].value, 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        cache.precision = 'class'
+        try:
+            # the signature of both calls is (int,), cached values are
+            # generalized to int instances
+            self.assertEqual(calls[3].infered()[0].value, 3)
+            infered = calls[4].infered()
+            self.assertEqual(len(infered), 1)
+            self.assertIsInstance(infered[0], Instance)
+            self.assertNotIsInstance(infered[0], nodes.Const)
+            self.assertEqual(infered[0].name, 'int')
+        finally:
+            cache.precision = 'value'
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_call_result_cache_same_class(self):
+        data = '''
+def f(a):
+    return 1
+def g(a):
+    return 2
+if __name__:
+    h = f
+else:
+    h = g
+h(1)
+h(1)
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        calls = [stmt.value for stmt in astroid.body[-2:]]
+        cache = scoped_nodes.CALL_RESULT_CACHE
+        cache.precision = 'class'
+        try:
+            self.assertEqual(sorted(v.value for v in calls[0].infered()),
+                             [1, 2])
+            # both cached results are the interned int instance
+            infered = calls[1].infered()
+            self.assertEqual(len(infered), 1)
+            self.assertIs(infered[0], infered[0]._proxied.instanciate_class())
+        finally:
+            cache.precision = 'value'
+
+    def test_call_result_cache_sequences(self):
+        data = '''
+def ident(arg):
+    return arg
+
+ident([1])
+ident([2])
+ident([2])
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        calls = [stmt.value for stmt in astroid.body[1:]]
+        self.assertEqual(calls[0].infered()[0].as_string(), '[1]')
+        self.assertEqual(calls[1].infered()[0].as_string(), '[2]')
+        cache = scoped_nodes.CALL_RESULT_CACHE
+        cache.precision = 'class'
+        try:
+            # results may be one of the arguments, don't cache them
+            self.assertEqual(calls[2].infered()[0].as_string(), '[2]')
+            self.assertEqual(calls[1].infered()[0].as_string(), '[2]')
+            self.assertEqual(calls[0].infered()[0].as_string(), '[1]')
+        finally:
+            cache.precision = 'value'
+
 
 class ClassNodeTC(TestCase):
 
@@ -404,6 +606,19 @@ A.__bases__ += (B,)
         self.assertIsInstance(astroid['A'].getattr('__bases__')[0], nodes.Tuple)
         self.assertIsInstance(astroid['A'].getattr('__bases__')[1], nodes.AssAttr)
 
+    def test_cls_special_attributes_mro(self):
+        astroid = abuilder.string_build('''
+class A(object): pass
+class B(A): pass
+class C(A): pass
+class D(B, C): pass
+''', __name__, __file__)
+        bases = astroid['D'].getattr('__bases__')[0]
+        self.assertEqual([cls.name for cls in bases.elts], ['B', 'C'])
+        mro = astroid['D'].getattr('__mro__')[0]
+        self.assertEqual([cls.name for cls in mro.elts],
+                         ['D', 'B', 'C', 'A', 'object'])
+
     def test_instance_special_attributes(self):
         for inst in (Instance(MODULE['YO']), nodes.List(), nodes.Const(1)):
             self.assertRaises(NotFoundError, inst.getattr, '__mro__')
@@ -526,6 +741,105 @@ class InterfaceCanNowBeFound:
         eee = NONREGR['Ccc']['Eee']
         self.assertEqual([n.name for n in eee.ancestors()], ['Ddd', 'Aaa', 'object'])
 
+    def test_mro(self):
+        astroid = abuilder.string_build('''
+class A(object): pass
+class B(A): pass
+class C(A): pass
+class D(B, C): pass
+class E(B, A, C): pass
+class F: pass
+class G(F): pass
+class H(F): pass
+class I(G, H): pass
+        ''', __name__, __file__)
+        def names(klass):
+            return [c.name for c in astroid[klass].mro()]
+        # C3 linearization for new style classes
+        self.assertEqual(names('D'), ['D', 'B', 'C', 'A', 'object'])
+        self.assertEqual([c.name for c in astroid['D'].ancestors()],
+                         ['B', 'C', 'A', 'object'])
+        # depth first for old style classes
+        self.assertEqual(names('I'), ['I', 'G', 'F', 'H'])
+        # inconsistent hierarchy: depth first as well
+        self.assertEqual(names('E'), ['E', 'B', 'A', 'object', 'C'])
+        # computed once until caches are invalidated
+        mro = astroid['D'].mro()
+        self.assertIs(astroid['D'].mro(), mro)
+        astroid['D'].bases.pop()
+        self.assertIs(astroid['D'].mro(), mro)
+        MANAGER.invalidate_caches()
+        self.assertEqual(names('D'), ['D', 'B', 'A', 'object'])
+
+    def test_namespace(self):
+        astroid = abuilder.string_build('''
+class A(object):
+    attr = 1
+    def __init__(self):
+        self.iattr = 1
+    def method(self): pass
+class B(A):
+    attr = 2
+    def __init__(self):
+        self.iattr = 2
+        del self.iattr
+        ''', __name__, __file__)
+        klass = astroid['B']
+        self.assertEqual([n.lineno for n in klass.getattr('attr')], [8, 3])
+        self.assertIs(klass.local_attr('method')[0], astroid['A']['method'])
+        self.assertEqual([n.lineno for n in klass.instance_attr('iattr')],
+                         [10, 5])
+        self.assertEqual([m.parent.name for m in klass.methods()
+                          if m.root() is astroid], ['B', 'A'])
+        # returned lists are copies of the memorized ones
+        klass.getattr('attr').pop()
+        self.assertEqual(len(klass.getattr('attr')), 2)
+        instance = klass.instanciate_class()
+        self.assertEqual(len(instance.getattr('iattr')), 2)
+        instance.getattr('iattr').pop()
+        self.assertEqual(len(klass.instance_attr('iattr')), 2)
+        # merged instance and class attributes are memorized as well
+        astroid['A'].instance_attrs['attr'] = [astroid['A']['__init__']]
+        astroid['A'].instance_attrs['__doc__'] = [astroid['A']['__init__']]
+        MANAGER.invalidate_caches()
+        merged = instance._getattr('attr')
+        self.assertEqual([n.lineno for n in merged], [4, 8, 3])
+        self.assertIs(instance._getattr('attr'), merged)
+        self.assertIs(Instance(klass)._getattr('attr'), merged)
+        self.assertEqual(len(instance._getattr('__doc__')), 2)
+        # memorized until caches are invalidated
+        del astroid['A'].locals['attr']
+        self.assertEqual(len(klass.getattr('attr')), 2)
+        MANAGER.invalidate_caches()
+        self.assertEqual(len(klass.getattr('attr')), 1)
+
+    def test_attribute_flags(self):
+        astroid = abuilder.string_build('''
+class Desc(object):
+    def __get__(self, instance, owner):
+        pass
+class Dynamic(object):
+    def __getattr__(self, name):
+        pass
+class A(Dynamic):
+    desc = Desc()
+    other = Dynamic()
+        ''', __name__, __file__)
+        klass = astroid['A']
+        self.assertTrue(astroid['Desc'].is_descriptor())
+        self.assertFalse(klass.is_descriptor())
+        self.assertTrue(klass.has_dynamic_getattr())
+        self.assertFalse(astroid['Desc'].has_dynamic_getattr())
+        self.assertEqual(list(klass.igetattr('desc')), [YES])
+        self.assertEqual(list(klass.igetattr('unknown')), [YES])
+        self.assertIsInstance(list(klass.igetattr('other'))[0], Instance)
+        # flags are kept until caches are invalidated
+        del astroid['Dynamic'].locals['__getattr__']
+        self.assertTrue(klass.has_dynamic_getattr())
+        MANAGER.invalidate_caches()
+        self.assertFalse(klass.has_dynamic_getattr())
+        self.assertRaises(InferenceError, list, klass.igetattr('unknown'))
+
 
     def test_classmethod_attributes(self):
         data = '''
@@ -570,6 +884,106 @@ class WebAppObject(object):
         self.assertEqual(len(inst.getattr('appli')), 2)
 
 
+    def test_instanciate_class_interned(self):
+        data = '''
+class A(object):
+    def method(self):
+        return self
+a = A()
+b = A().method()
+if a:
+    c = A()
+else:
+    c = A()
+d = c
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        klass = astroid['A']
+        inst = klass.instanciate_class()
+        self.assertIsInstance(inst, Instance)
+        self.assertIs(klass.instanciate_class(), inst)
+        self.assertEqual(astroid['a'].infered(), [inst])
+        self.assertEqual(astroid['b'].infered(), [inst])
+        self.assertEqual(astroid['d'].infered(), [inst])
+
+    def test_method_wrappers_cached(self):
+        data = '''
+class A(object):
+    def method(self):
+        pass
+    @classmethod
+    def cmethod(cls):
+        pass
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        klass = astroid['A']
+        inst = klass.instanciate_class()
+        method = list(klass.igetattr('method'))[0]
+        self.assertIsInstance(method, UnboundMethod)
+        bound = list(inst.igetattr('method'))[0]
+        self.assertIsInstance(bound, BoundMethod)
+        self.assertIs(bound.bound, inst)
+        self.assertIs(list(inst.igetattr('method'))[0], bound)
+        self.assertIs(list(klass.igetattr('method'))[0], method)
+        cmethod = list(klass.igetattr('cmethod'))[0]
+        self.assertIs(cmethod.bound, klass)
+        self.assertIs(list(klass.igetattr('cmethod'))[0], cmethod)
+        # hot attributes are forwarded to the function, wrappers have no dict
+        self.assertEqual(bound.name, 'method')
+        self.assertIs(bound.parent, klass)
+        self.assertEqual(bound.argnames(), ['self'])
+        self.assertRaises(AttributeError, setattr, bound, 'foo', None)
+
+    def test_attr_lookup_without_exception(self):
+        data = '''
+class A(object):
+    x = 1
+    def __init__(self):
+        self.y = 2
+class B(A):
+    def __init__(self):
+        self.y = 3
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        klass = astroid['B']
+        self.assertEqual(klass._getattr('missing'), [])
+        self.assertEqual(klass._getattr('__subclasses__'), [])
+        self.assertEqual(len(klass._getattr('x')), 1)
+        self.assertEqual(klass._instance_attr('missing'), [])
+        self.assertRaises(NotFoundError, klass.instance_attr, 'missing')
+        self.assertEqual(len(klass._instance_attr('y')), 2)
+        self.assertEqual(len(klass.instance_attr('y')), 2)
+        # the instance attributes of the class are left untouched
+        self.assertEqual(len(klass.instance_attrs['y']), 1)
+
+    def test_lookup_attr(self):
+        data = '''
+import os
+class A(object):
+    x = 1
+    def __init__(self):
+        self.y = 2
+    def method(self):
+        pass
+    method.z = 3
+        '''
+        astroid = abuilder.string_build(data, __name__, __file__)
+        klass = astroid['A']
+        inst = klass.instanciate_class()
+        method = klass['method']
+        for node, found, missing in ((astroid, 'A', 'B'), (klass, 'x', 'y'),
+                                     (inst, 'y', 'w'), (method, 'z', 'x')):
+            self.assertEqual(node.lookup_attr(found), node.getattr(found))
+            self.assertTrue(node.has_attr(found))
+            self.assertIsNone(node.lookup_attr(missing))
+            self.assertEqual(node.lookup_attr(missing, ()), ())
+            self.assertFalse(node.has_attr(missing))
+        self.assertTrue(astroid.has_attr('__file__'))
+        self.assertFalse(astroid.has_attr('__path__'))
+        self.assertIsNone(inst.lookup_attr('x', lookupclass=False))
+        self.assertFalse(inst.callable())
+
+
     def test_instance_getattr_with_class_attr(self):
         data = '''
 class Parent:
@@ -97,6 +97,31 @@ else:
         self.assertEqual(are_exclusive(f4, f1), False)
         self.assertEqual(are_exclusive(f4, f2), True)
 
+    def test_nested_branches(self):
+        astroid = builder.string_build('''
+if 1:
+    try:
+        for i in range(3):
+            a = 1
+    except KeyError:
+        if 2:
+            a = 2
+        a = 3
+else:
+    a = 4
+a = 5
+        ''')
+        a1, a2, a3, a4, a5 = astroid.locals['a']
+        self.assertEqual(are_exclusive(a1, a2), True)
+        self.assertEqual(are_exclusive(a1, a2, ['KeyError']), True)
+        self.assertEqual(are_exclusive(a1, a2, ['OSError']), False)
+        self.assertEqual(are_exclusive(a2, a3), False)
+        self.assertEqual(are_exclusive(a2, a4), True)
+        self.assertEqual(are_exclusive(a2, a4, ['KeyError']), False)
+        self.assertEqual(are_exclusive(a4, a5), False)
+        # the whole If statement isn't exclusive with its branches
+        self.assertEqual(are_exclusive(a4.statement().parent, a4), False)
+
 if __name__ == '__main__':
     unittest_main()
 